@@ -0,0 +1,123 @@
+"""
+Micro-benchmark — match serialization (validated path vs fast path)
+
+Run from the repo root:
+    python -m benchmarks.bench_serialization
+
+Legacy path: MatchResult(...) validated per match, MatchResponse validated and
+dumped by FastAPI (jsonable + json), Firestore dict rebuilt by hand.
+Fast path:   ScoredMatch records + one projection per target, encoded with orjson.
+"""
+
+import json
+import timeit
+
+import orjson
+
+from models.item import (
+    FoundItem,
+    ItemCategory,
+    MatchResponse,
+    MatchResult,
+    ScoreBreakdown,
+    ScoredMatch,
+)
+from models.serializers import match_response, match_to_firestore
+
+N_MATCHES = 50    # One full MAX_FOUND_ITEMS_PER_MATCH batch
+REPEAT    = 2000
+
+
+def _found_items() -> list[FoundItem]:
+    return [
+        FoundItem(
+            id          = f"found-{i}",
+            userId      = f"uid-{i}",
+            userName    = "Some Student",
+            userEmail   = "s_student@estin.dz",
+            title       = f"black wallet #{i}",
+            description = "leather wallet with a student card inside, found near the library",
+            category    = ItemCategory.DOCUMENTS,
+            location    = "library",
+            timestamp   = 1764977468368 + i,
+            imageURLs   = ["https://example.com/a.jpg"],
+        )
+        for i in range(N_MATCHES)
+    ]
+
+
+def legacy(found_items: list[FoundItem]) -> tuple[bytes, list[dict]]:
+    matches = [
+        MatchResult(
+            id               = f.id,
+            userId           = f.userId,
+            userName         = f.userName,
+            userEmail        = f.userEmail,
+            title            = f.title,
+            description      = f.description,
+            category         = f.category,
+            location         = f.location,
+            timestamp        = f.timestamp,
+            imageURLs        = f.imageURLs,
+            similarity_score = 72,
+            score_breakdown  = ScoreBreakdown(text_score=80, location_score=100, time_score=40, image_score=50),
+            ai_explanation   = "Both are black leather wallets found near the library.",
+        )
+        for f in found_items
+    ]
+    response = MatchResponse(lost_item_id="lost-1", matches=matches, message="ok")
+    body     = json.dumps(MatchResponse.model_validate(response).model_dump(mode="json")).encode()
+    firestore_results = [
+        {
+            "id":              m.id,
+            "userId":          m.userId,
+            "userName":        m.userName,
+            "userEmail":       m.userEmail,
+            "title":           m.title,
+            "similarityScore": m.similarity_score,
+            "aiExplanation":   m.ai_explanation,
+            "scoreBreakdown": {
+                "text":     m.score_breakdown.text_score,
+                "location": m.score_breakdown.location_score,
+                "time":     m.score_breakdown.time_score,
+                "image":    m.score_breakdown.image_score,
+            },
+        }
+        for m in matches
+    ]
+    return body, firestore_results
+
+
+def fast(found_items: list[FoundItem]) -> tuple[bytes, list[dict]]:
+    matches = [
+        ScoredMatch(
+            found            = f,
+            similarity_score = 72,
+            text_score       = 80,
+            location_score   = 100,
+            time_score       = 40,
+            image_score      = 50,
+            ai_explanation   = "Both are black leather wallets found near the library.",
+        )
+        for f in found_items
+    ]
+    body = orjson.dumps(match_response("lost-1", matches, "ok"))
+    return body, [match_to_firestore(m) for m in matches]
+
+
+def main() -> None:
+    found_items = _found_items()
+
+    # Both paths must produce the same payloads
+    legacy_body, legacy_fs = legacy(found_items)
+    fast_body,   fast_fs   = fast(found_items)
+    assert json.loads(legacy_body) == orjson.loads(fast_body)
+    assert legacy_fs == fast_fs
+
+    for name, fn in (("legacy", legacy), ("fast", fast)):
+        seconds = min(timeit.repeat(lambda: fn(found_items), number=REPEAT, repeat=3))
+        print(f"{name:<8} {seconds / REPEAT * 1e6:9.1f} µs per {N_MATCHES}-match response")
+
+
+if __name__ == "__main__":
+    main()
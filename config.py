@@ -23,6 +23,11 @@ class Settings(BaseSettings):
     MIN_SCORE_THRESHOLD: int = 40          # Discard matches below this %
     NOTIFY_THRESHOLD: int = 70             # Send FCM push above this %
     MAX_MATCHES_RETURNED: int = 5          # Top N results to return
+    TWO_PHASE_SCORING: bool = True         # Score-only pass, then explain the top N only
+    BATCH_EXPLANATIONS: bool = True        # Explain the top N in one Groq call
+    SCORE_CACHE_SIZE: int = 5000           # AI text scores kept in memory (LRU)
+    LOST_ITEMS_CACHE_SECONDS: int = 60     # Reuse the active lost-item list for reverse matching
+    MAX_REVERSE_CANDIDATES: int = 200      # Plausible lost items scored per new found item
 
     # ── Score Weights (must sum to 100) ────────────────────
     WEIGHT_TEXT: int = 50      # Title + description + category (Gemini AI)
@@ -30,6 +35,21 @@ class Settings(BaseSettings):
     WEIGHT_TIME: int = 10      # Time proximity (exponential decay)
     WEIGHT_IMAGE: int = 20     # Image visual similarity (Gemini Vision)
 
+    # ── Scheduling / Admission Control ─────────────────────
+    LLM_MAX_CONCURRENCY: int = 8             # Groq calls in flight at once
+    WEIGHT_INTERACTIVE: int = 8              # Fair-queueing share for /match
+    WEIGHT_BATCH: int = 1                    # Fair-queueing share for batch runs
+    MAX_INTERACTIVE_QUEUE_DEPTH: int = 200   # Reserved /match LLM calls before 429
+    MAX_PENDING_BATCH_JOBS: int = 2          # Queued + running batch jobs before 429
+
+    # ── Groq Circuit Breaker ───────────────────────────────
+    BREAKER_WINDOW: int = 20                 # Recent Groq calls considered
+    BREAKER_MIN_CALLS: int = 10              # Calls needed before the breaker can trip
+    BREAKER_ERROR_RATE: float = 0.5          # Failed-or-slow share that opens the circuit
+    BREAKER_SLOW_CALL_SECONDS: float = 5.0   # Slower calls count as failures
+    BREAKER_OPEN_SECONDS: float = 30.0       # Cool-down before probing recovery
+    BREAKER_PROBE_CALLS: int = 2             # Successful probes needed to close again
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -3,17 +3,22 @@ LGUINAH — AI Matching System API
 Powered by Google Gemini (FREE tier) + Firebase Firestore
 """
 
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import BackgroundTasks, FastAPI, Header, HTTPException
+from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from config import settings
-from models.item import LostItemRequest, MatchResponse
+from models.item import FoundItem, LostItemRequest, MatchResponse, ScoredMatch
+from models.serializers import match_response
 from services.firebase_service import FirebaseService
 from services.matching_service import MatchingService
+from services.scheduler import AdmissionRejected, MatchScheduler, Priority, Reservation
 
 logging.basicConfig(
     level  = logging.INFO,
@@ -24,21 +29,50 @@ logger = logging.getLogger(__name__)
 
 # ── App lifespan: init services once at startup ──────────────────────
 
+async def warm_up(app: FastAPI) -> None:
+    """
+    Background warm-up — SDK imports, credentials, connections and the
+    active lost-item list that /api/v1/match/found reads from its cache.
+    /ready turns 200 once those are in; Groq is best-effort since the
+    circuit breaker covers a Groq outage.
+    """
+    started = time.monotonic()
+    delay   = 1
+    while True:
+        try:
+            await app.state.firebase.warm_up()
+            await app.state.firebase.get_all_active_lost_items()
+            break
+        except Exception as e:
+            logger.warning(f"Firestore warm-up failed — retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    await app.state.matcher.warm_up()
+    app.state.ready = True
+    logger.info(f"✅ Warm and ready for traffic ({time.monotonic() - started:.1f}s)")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 Starting LGUINAH AI Matching API (Gemini)...")
-    app.state.firebase = FirebaseService()
-    app.state.matcher  = MatchingService()
-    logger.info("✅ All services ready")
+    # Construction is cheap — clients are built lazily / by the warm-up task
+    app.state.firebase  = FirebaseService()
+    app.state.scheduler = MatchScheduler()
+    app.state.matcher   = MatchingService(app.state.scheduler)
+    app.state.ready     = False
+    warm_task = asyncio.create_task(warm_up(app))
     yield
+    warm_task.cancel()
     logger.info("👋 Shutting down")
 
 
 app = FastAPI(
-    title       = "LGUINAH AI Matching API",
-    description = "Auto-matches lost & found items using Google Gemini + Firebase",
-    version     = "2.0.0",
-    lifespan    = lifespan,
+    title                  = "LGUINAH AI Matching API",
+    description            = "Auto-matches lost & found items using Google Gemini + Firebase",
+    version                = "2.0.0",
+    lifespan               = lifespan,
+    default_response_class = ORJSONResponse,
 )
 
 app.add_middleware(
@@ -56,6 +90,31 @@ def check_api_key(x_api_key: str = Header(...)):
         raise HTTPException(status_code=401, detail="Invalid API key")
 
 
+def too_busy(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code = 429,
+        detail      = f"Matching is busy ({e}). Try again shortly.",
+        headers     = {"Retry-After": "5"},
+    )
+
+
+async def interactive_admission(x_api_key: str = Header(...)):
+    """
+    API key check + admission for interactive matching. Reserves a full
+    match's worth of LLM calls (resized by the endpoint once it knows its
+    work) until the endpoint returns, so a burst cannot over-admit.
+    """
+    check_api_key(x_api_key)
+    try:
+        reservation = app.state.scheduler.admit(settings.MAX_FOUND_ITEMS_PER_MATCH + 1)
+    except AdmissionRejected as e:
+        raise too_busy(e)
+    try:
+        yield reservation
+    finally:
+        reservation.release()
+
+
 # ── Endpoints ─────────────────────────────────────────────────────────
 
 @app.get("/health", tags=["System"])
@@ -64,6 +123,29 @@ async def health():
     return {"status": "ok", "service": "LGUINAH Matching API", "model": settings.GROQ_MODEL}
 
 
+@app.get("/ready", tags=["System"])
+async def ready():
+    """Readiness check — 503 until Firestore (and, best-effort, Groq) connections and the lost-item cache are warm."""
+    body = {
+        "ready":     app.state.ready,
+        "firestore": app.state.firebase.warm,
+        "groq":      app.state.matcher.warm,
+    }
+    return ORJSONResponse(body, status_code=200 if app.state.ready else 503)
+
+
+@app.get("/api/v1/stats", tags=["System"])
+async def stats(x_api_key: str = Header(...)):
+    """Scheduler queue depth / wait times / shed counts, Groq breaker state, /matches writes avoided."""
+    check_api_key(x_api_key)
+    return {
+        "scheduler":    app.state.scheduler.stats(),
+        "groq_breaker": app.state.matcher.breaker.stats(),
+        "match_writes": app.state.firebase.write_stats,
+        "match_index":  {"lost_items": len(app.state.matcher.index)},
+    }
+
+
 @app.post(
     "/api/v1/match",
     response_model = MatchResponse,
@@ -73,112 +155,250 @@ async def health():
 async def match_lost_item(
     request:          LostItemRequest,
     background_tasks: BackgroundTasks,
-    x_api_key:        str = Header(...),
+    admission:        Reservation = Depends(interactive_admission),
+    x_deadline_ms:    int | None  = Header(None, ge=1),
+    deadline_ms:      int | None  = Query(None, ge=1),
 ):
     """
     **Main endpoint** — called automatically after a user posts a lost item.
 
     Steps:
     1. Fetch all active "found" items from Firestore
-    2. Run Gemini AI comparison for each (text + image, in parallel)
+    2. Run AI comparison for each (interactive priority — ahead of batch runs)
     3. Return top matches ranked by similarity score (0–100%)
     4. Save results to Firestore `/matches/{item_id}` in the background
     5. Send FCM push notification if top match ≥ 70% confidence
+
+    Optional latency budget (`X-Deadline-Ms` header or `deadline_ms` query):
+    pairs the AI has not scored by then get a local keyword estimate and
+    `complete: false`. Late AI scores are saved to `/matches` afterwards.
     """
-    check_api_key(x_api_key)
+    budgets  = [ms for ms in (x_deadline_ms, deadline_ms) if ms is not None]
+    deadline = time.monotonic() + min(budgets) / 1000 if budgets else None
 
     firebase: FirebaseService = app.state.firebase
     matcher:  MatchingService = app.state.matcher
 
     logger.info(f"🔍 Matching lost item '{request.title}' [category: {request.category.value}]")
 
+    # Reverse matching may be serving a cached lost-item list — make sure it has this one
+    firebase.remember_lost_item(request)
+
     # 1. Fetch found items
     found_items = await firebase.get_active_found_items(
         exclude_user_id=request.userId
     )
+    admission.resize(len(found_items) + 1)   # One score per pair + one explanation call
 
+    # Responses are returned pre-serialised: `response_model` only documents the
+    # shape, FastAPI skips re-validating a Response object.
     if not found_items:
-        return MatchResponse(
+        return ORJSONResponse(match_response(
             lost_item_id = request.id,
             matches      = [],
             message      = "No active found posts to compare against.",
-        )
+        ))
+
+    notified   = False
+    late_saved = False
+
+    def should_notify(matches: list[ScoredMatch]) -> bool:
+        # Never notify on a local estimate — wait for the AI score
+        top = matches[0] if matches else None
+        return bool(top) and top.complete and top.similarity_score >= settings.NOTIFY_THRESHOLD
+
+    async def save_results(matches: list[ScoredMatch]) -> None:
+        if not late_saved:   # Don't let the provisional results overwrite refined ones
+            await firebase.save_match_results(lost_item_id=request.id, matches=matches)
+
+    async def save_late_results(matches: list[ScoredMatch]) -> None:
+        nonlocal late_saved
+        if not matches:
+            return
+        late_saved = True
+        await firebase.save_match_results(lost_item_id=request.id, matches=matches)
+        if not notified and should_notify(matches):
+            await firebase.send_match_notification(
+                user_uid        = request.userId,
+                lost_item_title = request.title,
+                match_count     = len(matches),
+                top_match_id    = matches[0].id,
+            )
 
     # 2. AI Matching
     matches = await matcher.find_matches(
         lost_item   = request,
         found_items = found_items,
+        deadline    = deadline,
+        on_late     = save_late_results,
     )
 
     # 3. Save + notify (background — does not delay the response)
     if matches:
-        background_tasks.add_task(
-            firebase.save_match_results,
-            lost_item_id = request.id,
-            matches      = matches,
-        )
+        background_tasks.add_task(save_results, matches)
 
-        top = matches[0]
-        if top.similarity_score >= settings.NOTIFY_THRESHOLD:
+        if should_notify(matches):
+            notified = True
             background_tasks.add_task(
                 firebase.send_match_notification,
                 user_uid        = request.userId,
                 lost_item_title = request.title,
                 match_count     = len(matches),
-                top_match_id    = top.id,
+                top_match_id    = matches[0].id,
             )
 
     top_score = matches[0].similarity_score if matches else 0
     logger.info(f"✅ {len(matches)} match(es) found — top score: {top_score}%")
 
-    return MatchResponse(
+    # Flag responses scored (partly) without the AI, incl. empty ones while the breaker is open
+    degraded = any(m.degraded for m in matches) or not matcher.breaker.available()
+
+    return ORJSONResponse(match_response(
         lost_item_id = request.id,
         matches      = matches,
         message      = f"{len(matches)} potential match(es) found.",
-    )
+        degraded     = degraded,
+        complete     = all(m.complete for m in matches),
+    ))
 
 
 @app.post(
-    "/api/v1/match/batch",
-    tags    = ["Admin"],
-    summary = "Re-run AI matching for ALL unresolved lost items",
+    "/api/v1/match/found",
+    tags    = ["Matching"],
+    summary = "Match a newly posted found item against active lost items",
 )
-async def batch_rematch(
+async def match_found_item(
+    found:            FoundItem,
     background_tasks: BackgroundTasks,
-    x_api_key:        str = Header(...),
+    admission:        Reservation = Depends(interactive_admission),
 ):
     """
-    **Admin endpoint** — re-runs AI matching for every unresolved lost item.
-    Useful when many new found items are posted at once.
-    """
-    check_api_key(x_api_key)
+    **Reverse matching** — called after a user posts a found item.
 
+    Scores the found item only against lost items that plausibly match it,
+    keeps an in-memory top-K per lost item, and writes `/matches/{id}` and
+    notifies only for lost items whose top-K actually changed.
+
+    `failed` lists lost items that could not be checked (AI or Firestore error).
+    Posting the same found item again retries them without re-notifying the rest.
+    """
     firebase: FirebaseService = app.state.firebase
     matcher:  MatchingService = app.state.matcher
 
-    lost_items  = await firebase.get_all_active_lost_items()
-    found_items = await firebase.get_active_found_items()
+    lost_items = await firebase.get_all_active_lost_items(
+        max_age=settings.LOST_ITEMS_CACHE_SECONDS
+    )
+    changed, failed = await matcher.match_found_item(
+        found         = found,
+        lost_items    = lost_items,
+        lost_items_at = firebase.lost_items_queried_at,
+        load_existing = firebase.get_match_results,
+        reservation   = admission,
+    )
 
-    if not lost_items or not found_items:
-        return {"message": "Nothing to process.", "lost": len(lost_items), "found": len(found_items)}
+    updated = []
+    for lost, top_k, rank in changed:
+        updated.append({
+            "lost_item_id":     lost.id,
+            "rank":             rank,
+            "similarity_score": top_k[rank - 1].similarity_score,
+        })
+        background_tasks.add_task(
+            firebase.save_match_results,
+            lost_item_id = lost.id,
+            matches      = top_k,
+        )
 
-    results = []
-    for lost in lost_items:
-        matches = await matcher.find_matches(lost_item=lost, found_items=found_items)
-        if matches:
-            results.append({"item_id": lost.item_id, "match_count": len(matches)})
+        # Notify the owner only when this found item is their new best match
+        if rank == 1 and top_k[0].similarity_score >= settings.NOTIFY_THRESHOLD:
             background_tasks.add_task(
-                firebase.save_match_results,
-                lost_item_id = lost.item_id,
-                matches      = matches,
+                firebase.send_match_notification,
+                user_uid        = lost.userId,
+                lost_item_title = lost.title,
+                match_count     = len(top_k),
+                top_match_id    = found.id,
             )
 
+    logger.info(f"✅ Found item '{found.title}' entered the top matches of {len(updated)} lost item(s)")
+    if failed:
+        logger.warning(f"⚠️  {len(failed)} lost item(s) could not be checked against '{found.title}'")
+
+    message = f"{len(updated)} lost item(s) have a new potential match."
+    if failed:
+        message += f" {len(failed)} could not be checked — retry to cover them."
+
     return {
-        "processed":    len(lost_items),
-        "with_matches": len(results),
-        "details":      results,
+        "found_item_id": found.id,
+        "updated":       updated,
+        "failed":        failed,
+        "message":       message,
     }
 
 
+@app.post(
+    "/api/v1/match/batch",
+    status_code = 202,
+    tags        = ["Admin"],
+    summary     = "Re-run AI matching for ALL unresolved lost items",
+)
+async def batch_rematch(x_api_key: str = Header(...)):
+    """
+    **Admin endpoint** — re-runs AI matching for every unresolved lost item.
+    Useful when many new found items are posted at once.
+
+    Runs as a background job at batch priority, so live /match calls are
+    served first. Returns a job id — poll `/api/v1/match/batch/{job_id}`.
+    """
+    check_api_key(x_api_key)
+
+    firebase:  FirebaseService = app.state.firebase
+    matcher:   MatchingService = app.state.matcher
+    scheduler: MatchScheduler  = app.state.scheduler
+
+    async def run_batch() -> dict:
+        lost_items  = await firebase.get_all_active_lost_items()
+        found_items = await firebase.get_active_found_items()
+
+        if not lost_items or not found_items:
+            return {"message": "Nothing to process.", "lost": len(lost_items), "found": len(found_items)}
+
+        results = []
+        for lost in lost_items:
+            matches = await matcher.find_matches(
+                lost_item   = lost,
+                found_items = found_items,
+                priority    = Priority.BATCH,
+            )
+            if matches:
+                results.append({"item_id": lost.id, "match_count": len(matches)})
+                await firebase.save_match_results(lost_item_id=lost.id, matches=matches)
+
+        return {
+            "processed":    len(lost_items),
+            "with_matches": len(results),
+            "details":      results,
+        }
+
+    try:
+        job_id = scheduler.submit_job(run_batch)
+    except AdmissionRejected as e:
+        raise too_busy(e)
+
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get(
+    "/api/v1/match/batch/{job_id}",
+    tags    = ["Admin"],
+    summary = "Status and result of a batch re-match job",
+)
+async def batch_status(job_id: str, x_api_key: str = Header(...)):
+    check_api_key(x_api_key)
+    job = app.state.scheduler.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
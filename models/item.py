@@ -4,6 +4,7 @@ Pydantic models — matching your actual Firestore 'lostItems' collection struct
 
 from pydantic import BaseModel, Field
 from typing import Optional
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
@@ -96,6 +97,31 @@ class FoundItem(BaseModel):
         return datetime.fromtimestamp(self.timestamp / 1000, tz=timezone.utc)
 
 
+@dataclass(slots=True)
+class ScoredMatch:
+    """
+    A scored found item, as produced by MatchingService.
+
+    Deliberately not a pydantic model: it only references the already
+    validated FoundItem, and models/serializers.py projects it straight to
+    the HTTP response and the Firestore payload (MatchResult below only
+    documents the response shape).
+    """
+    found:            FoundItem
+    similarity_score: int
+    text_score:       int
+    location_score:   int
+    time_score:       int
+    image_score:      int
+    ai_explanation:   str
+    degraded:         bool = False   # Text scored by keyword fallback, not the AI
+    complete:         bool = True    # False = deadline hit before the AI scored it
+
+    @property
+    def id(self) -> str:
+        return self.found.id
+
+
 # ─────────────────────────────────────────
 # RESPONSE
 # ─────────────────────────────────────────
@@ -121,9 +147,13 @@ class MatchResult(BaseModel):
     similarity_score: int            = Field(..., ge=0, le=100)
     score_breakdown:  ScoreBreakdown
     ai_explanation:   str
+    degraded:         bool           = False
+    complete:         bool           = True
 
 
 class MatchResponse(BaseModel):
     lost_item_id: str
     matches:      list[MatchResult]
-    message:      str
\ No newline at end of file
+    message:      str
+    degraded:     bool = False   # AI unavailable — some or all scores are keyword-based
+    complete:     bool = True    # False = deadline hit, some scores are local estimates
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Serializers — one conversion path from scored matches to the wire
+
+MatchingService produces ScoredMatch records that reference the already
+validated FoundItem. They are projected straight to plain dicts for:
+
+  - the HTTP response  (encoded with orjson via ORJSONResponse)
+  - the Firestore /matches/{id} document
+
+No MatchResult / MatchResponse instances are built on this path — pydantic
+would re-validate (or, with model_construct, re-copy) every field.
+"""
+
+from models.item import FoundItem, ItemCategory, ScoredMatch
+
+
+def match_to_api(m: ScoredMatch) -> dict:
+    """Same shape as MatchResult.model_dump(mode="json")."""
+    f = m.found
+    return {
+        "id":               f.id,
+        "userId":           f.userId,
+        "userName":         f.userName,
+        "userEmail":        f.userEmail,
+        "title":            f.title,
+        "description":      f.description,
+        "category":         f.category.value,
+        "location":         f.location,
+        "timestamp":        f.timestamp,
+        "imageURLs":        f.imageURLs,
+        "similarity_score": m.similarity_score,
+        "score_breakdown": {
+            "text_score":     m.text_score,
+            "location_score": m.location_score,
+            "time_score":     m.time_score,
+            "image_score":    m.image_score,
+        },
+        "ai_explanation":   m.ai_explanation,
+        "degraded":         m.degraded,
+        "complete":         m.complete,
+    }
+
+
+def match_to_firestore(m: ScoredMatch) -> dict:
+    """One entry of the `results` array in /matches/{lost_item_id}."""
+    f = m.found
+    return {
+        "id":              f.id,
+        "userId":          f.userId,
+        "userName":        f.userName,
+        "userEmail":       f.userEmail,
+        "title":           f.title,
+        "similarityScore": m.similarity_score,
+        "aiExplanation":   m.ai_explanation,
+        "scoreBreakdown": {
+            "text":     m.text_score,
+            "location": m.location_score,
+            "time":     m.time_score,
+            "image":    m.image_score,
+        },
+    }
+
+
+def match_from_firestore(d: dict) -> ScoredMatch:
+    """
+    Inverse of match_to_firestore, used to seed the reverse-matching index.
+    Fields the document does not store (description, category, …) are left
+    empty — fine for re-writing /matches, not for building an API response.
+    """
+    breakdown = d.get("scoreBreakdown", {})
+    return ScoredMatch(
+        found = FoundItem(
+            id          = d["id"],
+            userId      = d.get("userId",    ""),
+            userName    = d.get("userName",  ""),
+            userEmail   = d.get("userEmail", ""),
+            title       = d.get("title",     ""),
+            description = "",
+            category    = ItemCategory.OTHER,
+            timestamp   = 0,
+        ),
+        similarity_score = d.get("similarityScore", 0),
+        text_score       = breakdown.get("text",     0),
+        location_score   = breakdown.get("location", 0),
+        time_score       = breakdown.get("time",     0),
+        image_score      = breakdown.get("image",    0),
+        ai_explanation   = d.get("aiExplanation", ""),
+    )
+
+
+def match_response(
+    lost_item_id: str,
+    matches:      list[ScoredMatch],
+    message:      str,
+    degraded:     bool = False,
+    complete:     bool = True,
+) -> dict:
+    """Same shape as MatchResponse.model_dump(mode="json")."""
+    return {
+        "lost_item_id": lost_item_id,
+        "matches":      [match_to_api(m) for m in matches],
+        "message":      message,
+        "degraded":     degraded,
+        "complete":     complete,
+    }
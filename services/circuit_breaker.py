@@ -0,0 +1,138 @@
+"""
+CircuitBreaker — shared health gate for the Groq client
+
+  CLOSED    — calls go through; outcomes of the last N calls are recorded
+  OPEN      — too many recent calls failed or were slow; callers skip Groq
+              entirely and use local keyword scoring
+  HALF_OPEN — after a cool-down, a few probe calls test recovery:
+              all succeed → CLOSED, any failure → OPEN again
+
+A call counts against the breaker if it raised, or took longer than
+BREAKER_SLOW_CALL_SECONDS (Groq saturated but still answering).
+"""
+
+import logging
+import time
+from collections import deque
+from enum import Enum
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(str, Enum):
+    CLOSED    = "closed"
+    OPEN      = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Groq while the breaker is open."""
+
+
+class CircuitBreaker:
+
+    def __init__(self, name: str):
+        self.name  = name
+        self.state = BreakerState.CLOSED
+
+        self._outcomes: deque[bool] = deque(maxlen=settings.BREAKER_WINDOW)   # True = bad call
+        self._opened_at       = 0.0
+        self._probes_inflight = 0
+        self._probes_passed   = 0
+        self._generation      = 0   # Bumped on every state change; stale outcomes are ignored
+
+        self.opened_count   = 0
+        self.rejected_count = 0
+
+    # ─────────────────────────────────────────────────────────────────
+    # GATE
+    # ─────────────────────────────────────────────────────────────────
+
+    def available(self) -> bool:
+        """Cheap check without side effects — would `acquire()` let a call through?"""
+        if self.state == BreakerState.CLOSED:
+            return True
+        if self.state == BreakerState.OPEN:
+            return self._cooled_down()
+        return self._probes_inflight < settings.BREAKER_PROBE_CALLS
+
+    def acquire(self) -> int | None:
+        """
+        Reserve the right to make one call. Returns a ticket to pass to
+        `record()` / `abandon()`, or None if the call must not be made.
+        """
+        if self.state == BreakerState.OPEN and self._cooled_down():
+            self._transition(BreakerState.HALF_OPEN)
+            self._probes_inflight = 0
+            self._probes_passed   = 0
+
+        if self.state == BreakerState.CLOSED:
+            return self._generation
+        if self.state == BreakerState.HALF_OPEN and self._probes_inflight < settings.BREAKER_PROBE_CALLS:
+            self._probes_inflight += 1
+            return self._generation
+
+        self.rejected_count += 1
+        return None
+
+    def record(self, ticket: int, ok: bool, latency: float) -> None:
+        if ticket != self._generation:
+            return   # Call started under a previous state
+
+        bad = not ok or latency > settings.BREAKER_SLOW_CALL_SECONDS
+
+        if self.state == BreakerState.HALF_OPEN:
+            self._probes_inflight -= 1
+            if bad:
+                self._trip(f"probe failed ({latency:.1f}s)")
+                return
+            self._probes_passed += 1
+            if self._probes_passed >= settings.BREAKER_PROBE_CALLS:
+                self._outcomes.clear()
+                self._transition(BreakerState.CLOSED)
+            return
+
+        self._outcomes.append(bad)
+        if len(self._outcomes) >= settings.BREAKER_MIN_CALLS:
+            error_rate = sum(self._outcomes) / len(self._outcomes)
+            if error_rate >= settings.BREAKER_ERROR_RATE:
+                self._trip(f"{error_rate:.0%} of last {len(self._outcomes)} calls failed or were slow")
+
+    def abandon(self, ticket: int) -> None:
+        """The call was cancelled before it finished — free its probe slot."""
+        if ticket == self._generation and self.state == BreakerState.HALF_OPEN:
+            self._probes_inflight -= 1
+
+    # ─────────────────────────────────────────────────────────────────
+    # INTERNAL
+    # ─────────────────────────────────────────────────────────────────
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self._opened_at >= settings.BREAKER_OPEN_SECONDS
+
+    def _trip(self, reason: str) -> None:
+        self._opened_at = time.monotonic()
+        self.opened_count += 1
+        self._transition(BreakerState.OPEN)
+        logger.warning(f"⚡ {self.name} circuit OPEN — {reason}")
+
+    def _transition(self, state: BreakerState) -> None:
+        if state != self.state:
+            logger.info(f"⚡ {self.name} circuit {self.state.value} → {state.value}")
+        self.state        = state
+        self._generation += 1
+
+    # ─────────────────────────────────────────────────────────────────
+    # STATS
+    # ─────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        return {
+            "state":         self.state.value,
+            "recent_calls":  len(self._outcomes),
+            "recent_errors": sum(self._outcomes),
+            "opened":        self.opened_count,
+            "rejected":      self.rejected_count,
+        }
@@ -6,23 +6,42 @@ Status:     "LOST" / "FOUND"  (uppercase)
 Category:   "KEYS", "PHONE" … (uppercase)
 Timestamp:  number (milliseconds since epoch)
 Fields:     userId, userName, userEmail, imageURLs
+
+firebase_admin / google.cloud are imported by `_init_firebase()` — in a worker
+thread from `warm_up()`, or on first use — they dominate import time and
+slow down pod start.
 """
 
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
-import firebase_admin
-from firebase_admin import credentials, firestore, messaging
-from google.cloud.firestore_v1 import AsyncClient
-from google.oauth2 import service_account
+import orjson
 
 from config import settings
-from models.item import FoundItem, MatchResult, ItemCategory, LostItemRequest
+from models.item import FoundItem, ItemCategory, LostItemRequest, ScoredMatch
+from models.serializers import match_from_firestore, match_to_firestore
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
 
 logger = logging.getLogger(__name__)
 
 COLLECTION = "lostItems"   # ← your actual collection name
 
+# Per-result fields that change when scores shift but the ranking does not
+_SCORE_FIELDS = ("similarityScore", "aiExplanation", "scoreBreakdown")
+
+# Free text from the LLM — a new wording of an unchanged result is not a change
+_TEXT_FIELDS = ("aiExplanation",)
+
+_FINGERPRINT_HINTS = 10_000   # /matches fingerprints remembered per process (LRU)
+
 
 def _to_category(value: str) -> ItemCategory:
     """Convert any casing to a valid ItemCategory, fallback to OTHER."""
@@ -47,25 +66,72 @@ def _to_ms_timestamp(value) -> int:
     return int(datetime.now(tz=timezone.utc).timestamp() * 1000)
 
 
+def _fingerprint(value) -> str:
+    """Stable content hash of a JSON-serialisable value."""
+    return hashlib.sha1(orjson.dumps(value, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
 class FirebaseService:
 
     def __init__(self):
-        if not firebase_admin._apps:
+        self._db:          "AsyncClient | None" = None
+        self._google_creds = None
+        self._init_lock    = threading.Lock()
+        self.warm          = False
+
+        # lost_item_id → (identity fingerprint, full results fingerprint) of our
+        # last write. A hint only: other pods and the app also write /matches.
+        self._match_fingerprints: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self.write_stats = {"full": 0, "merged": 0, "skipped": 0}
+
+        self._lost_items:          list[LostItemRequest] = []
+        self.lost_items_queried_at = float("-inf")   # time.monotonic() when the cached query started
+
+    # ─────────────────────────────────────────────────────────────────
+    # STARTUP
+    # ─────────────────────────────────────────────────────────────────
+
+    def _init_firebase(self):
+        """Import the SDKs and read the service account file once. Idempotent."""
+        with self._init_lock:
+            if self._google_creds is not None:
+                return self._google_creds
+
+            # Everything used later, so the event loop never pays an import
+            import firebase_admin
+            import google.api_core.exceptions  # noqa: F401
+            import google.cloud.firestore_v1.base_query  # noqa: F401
+            from firebase_admin import credentials, firestore, messaging  # noqa: F401
+
             cred = credentials.Certificate(settings.FIREBASE_SERVICE_ACCOUNT_PATH)
-            firebase_admin.initialize_app(
-                cred, {"projectId": settings.FIREBASE_PROJECT_ID}
+            if not firebase_admin._apps:
+                firebase_admin.initialize_app(
+                    cred, {"projectId": settings.FIREBASE_PROJECT_ID}
+                )
+
+            # Reuse the same parsed key for Firestore (its scopes include cloud-platform)
+            # — passing credentials explicitly avoids DefaultCredentialsError on Windows
+            self._google_creds = cred.get_credential()
+            return self._google_creds
+
+    @property
+    def db(self) -> "AsyncClient":
+        if self._db is None:
+            credentials = self._init_firebase()   # Imports the SDKs if warm_up() has not
+            from google.cloud.firestore_v1 import AsyncClient
+
+            self._db = AsyncClient(
+                project=settings.FIREBASE_PROJECT_ID,
+                credentials=credentials,
             )
+            logger.info("✅ Firebase / Firestore ready")
+        return self._db
 
-        # Pass credentials explicitly — avoids DefaultCredentialsError on Windows
-        google_creds = service_account.Credentials.from_service_account_file(
-            settings.FIREBASE_SERVICE_ACCOUNT_PATH,
-            scopes=["https://www.googleapis.com/auth/cloud-platform"],
-        )
-        self.db: AsyncClient = firestore.AsyncClient(
-            project=settings.FIREBASE_PROJECT_ID,
-            credentials=google_creds,
-        )
-        logger.info("✅ Firebase / Firestore ready")
+    async def warm_up(self) -> None:
+        """Load SDKs off the event loop, then open the gRPC channel with a tiny read."""
+        await asyncio.to_thread(self._init_firebase)
+        await self.db.collection(COLLECTION).limit(1).get()
+        self.warm = True
 
     # ─────────────────────────────────────────────────────────────────
     # READ
@@ -122,8 +188,16 @@ class FirebaseService:
         logger.info(f"📦 Loaded {len(items)} active FOUND items from Firestore")
         return items
 
-    async def get_all_active_lost_items(self) -> list[LostItemRequest]:
-        """Returns all unresolved LOST posts. Used for batch re-matching."""
+    async def get_all_active_lost_items(self, max_age: float = 0) -> list[LostItemRequest]:
+        """
+        Returns all unresolved LOST posts. Used for batch and reverse matching.
+        `max_age` (seconds) allows reusing the previous query result.
+        """
+        if time.monotonic() - self.lost_items_queried_at < max_age:
+            return self._lost_items
+
+        started = time.monotonic()
+
         from google.cloud.firestore_v1.base_query import FieldFilter
         query = (
             self.db.collection(COLLECTION)
@@ -155,46 +229,122 @@ class FirebaseService:
             except Exception as e:
                 logger.warning(f"Skipping malformed lost item {doc.id}: {e}")
 
+        self._lost_items           = items
+        self.lost_items_queried_at = started
         return items
 
+    def remember_lost_item(self, item: LostItemRequest) -> None:
+        """Add a just-posted lost item to the cached list, so it can be reverse-matched right away."""
+        self._lost_items = [i for i in self._lost_items if i.id != item.id] + [item]
+
+    async def get_match_results(self, lost_item_id: str) -> list[ScoredMatch]:
+        """Reads the stored /matches/{lost_item_id} results (empty if none yet)."""
+        snapshot = await self.db.collection("matches").document(lost_item_id).get()
+        if not snapshot.exists:
+            return []
+        data = snapshot.to_dict()
+
+        # Remember the fingerprints too — spares a read in save_match_results
+        if "identityFingerprint" in data and "resultsFingerprint" in data:
+            self._remember_fingerprints(
+                lost_item_id, (data["identityFingerprint"], data["resultsFingerprint"])
+            )
+        return [match_from_firestore(r) for r in data.get("results", [])]
+
     # ─────────────────────────────────────────────────────────────────
     # WRITE
     # ─────────────────────────────────────────────────────────────────
 
     async def save_match_results(
-        self, lost_item_id: str, matches: list[MatchResult]
+        self, lost_item_id: str, matches: list[ScoredMatch]
     ) -> None:
         """
         Writes match results to /matches/{lost_item_id}.
         Your Kotlin app listens to this document in real-time to update the UI.
+
+        Every write wakes those listeners, so we avoid writing at all if the
+        results are unchanged, and only update the `results` field (keeping
+        `matchedAt`) when the same items are ranked the same way with new scores.
+        Explanations are left out of the comparison: when items and scores are
+        unchanged the stored explanations are kept, even if the AI (after a
+        restart or score-cache eviction) would word them differently today.
+
+        The fingerprints remembered from our own last write are only a hint —
+        a skip is confirmed against the stored document first, and a partial
+        update falls back to a full write if the document has gone.
         """
         doc_ref = self.db.collection("matches").document(lost_item_id)
 
-        payload = {
-            "lostItemId": lost_item_id,
-            "matchedAt":  firestore.SERVER_TIMESTAMP,
-            "results": [
-                {
-                    "id":              m.id,
-                    "userId":          m.userId,
-                    "userName":        m.userName,
-                    "userEmail":       m.userEmail,
-                    "title":           m.title,
-                    "similarityScore": m.similarity_score,
-                    "aiExplanation":   m.ai_explanation,
-                    "scoreBreakdown": {
-                        "text":     m.score_breakdown.text_score,
-                        "location": m.score_breakdown.location_score,
-                        "time":     m.score_breakdown.time_score,
-                        "image":    m.score_breakdown.image_score,
-                    },
-                }
-                for m in matches
-            ],
-        }
-
-        await doc_ref.set(payload)
-        logger.info(f"💾 Saved {len(matches)} match(es) → /matches/{lost_item_id}")
+        results = [match_to_firestore(m) for m in matches]
+
+        identity_fp = _fingerprint(
+            [{k: v for k, v in r.items() if k not in _SCORE_FIELDS} for r in results]
+        )
+        results_fp  = _fingerprint(
+            [{k: v for k, v in r.items() if k not in _TEXT_FIELDS} for r in results]
+        )
+        new         = (identity_fp, results_fp)
+
+        stored = self._match_fingerprints.get(lost_item_id)
+        if stored is None or stored == new:
+            # Unknown, or looks unchanged — only the stored document can tell
+            stored = await self._load_match_fingerprints(doc_ref)
+
+        if stored == new:
+            self.write_stats["skipped"] += 1
+            self._remember_fingerprints(lost_item_id, new)
+            logger.info(f"⏭️  Unchanged results — skipped write → /matches/{lost_item_id}")
+            return
+
+        from firebase_admin import firestore
+        from google.api_core.exceptions import NotFound
+
+        merged = False
+        if stored is not None and stored[0] == identity_fp:
+            # Same items in the same order — only scores / explanations moved.
+            # update() fails if the document was deleted meanwhile; all three
+            # fields are rewritten, so the document stays self-consistent.
+            try:
+                await doc_ref.update({
+                    "results":             results,
+                    "identityFingerprint": identity_fp,
+                    "resultsFingerprint":  results_fp,
+                })
+                merged = True
+            except NotFound:
+                pass
+
+        if merged:
+            self.write_stats["merged"] += 1
+            logger.info(f"💾 Updated scores of {len(matches)} match(es) → /matches/{lost_item_id}")
+        else:
+            await doc_ref.set({
+                "lostItemId":          lost_item_id,
+                "matchedAt":           firestore.SERVER_TIMESTAMP,
+                "results":             results,
+                "identityFingerprint": identity_fp,
+                "resultsFingerprint":  results_fp,
+            })
+            self.write_stats["full"] += 1
+            logger.info(f"💾 Saved {len(matches)} match(es) → /matches/{lost_item_id}")
+
+        self._remember_fingerprints(lost_item_id, new)
+
+    def _remember_fingerprints(self, lost_item_id: str, fingerprints: tuple[str, str]) -> None:
+        self._match_fingerprints[lost_item_id] = fingerprints
+        self._match_fingerprints.move_to_end(lost_item_id)
+        while len(self._match_fingerprints) > _FINGERPRINT_HINTS:
+            self._match_fingerprints.popitem(last=False)
+
+    async def _load_match_fingerprints(self, doc_ref) -> tuple[str, str] | None:
+        """Fingerprints stored with the last write, by any process."""
+        snapshot = await doc_ref.get()
+        if not snapshot.exists:
+            return None
+        data = snapshot.to_dict()
+        if "identityFingerprint" not in data or "resultsFingerprint" not in data:
+            return None
+        return data["identityFingerprint"], data["resultsFingerprint"]
 
     # ─────────────────────────────────────────────────────────────────
     # FCM NOTIFICATIONS
@@ -212,6 +362,8 @@ class FirebaseService:
         Only fires when top match score >= NOTIFY_THRESHOLD (default 70%).
         Reads the FCM token from /users/{uid}.fcm_token in Firestore.
         """
+        from firebase_admin import messaging
+
         try:
             user_doc = await self.db.collection("users").document(user_uid).get()
             if not user_doc.exists:
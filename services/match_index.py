@@ -0,0 +1,82 @@
+"""
+MatchIndex — in-memory top-K found items per lost item
+
+Lets a newly posted found item be matched in reverse: it is offered to the
+heap of every lost item it plausibly matches, and only lost items whose
+top-K actually changed need a Firestore write and a notification.
+
+Each heap is a min-heap on similarity score, bounded to MAX_MATCHES_RETURNED,
+so the weakest of the current top-K is always at index 0.
+"""
+
+import heapq
+import time
+
+from config import settings
+from models.item import ScoredMatch
+
+# (similarity_score, found_id, match) — found_id breaks ties so ScoredMatch is never compared
+_Entry = tuple[int, str, ScoredMatch]
+
+
+class MatchIndex:
+
+    def __init__(self):
+        self.k = settings.MAX_MATCHES_RETURNED
+        self._heaps:   dict[str, list[_Entry]] = {}
+        self._touched: dict[str, float] = {}   # lost_item_id → time.monotonic() of last update
+
+    def has(self, lost_item_id: str) -> bool:
+        return lost_item_id in self._heaps
+
+    def replace(self, lost_item_id: str, matches: list[ScoredMatch]) -> None:
+        """Set the top-K from a full (forward or batch) match run."""
+        heap = [(m.similarity_score, m.id, m) for m in matches]
+        heapq.heapify(heap)
+        while len(heap) > self.k:
+            heapq.heappop(heap)
+        self._heaps[lost_item_id]   = heap
+        self._touched[lost_item_id] = time.monotonic()
+
+    def offer(self, lost_item_id: str, match: ScoredMatch) -> bool:
+        """Add `match` if it makes the top-K. Returns True if the top-K changed."""
+        heap  = self._heaps.setdefault(lost_item_id, [])
+        entry = (match.similarity_score, match.id, match)
+        self._touched[lost_item_id] = time.monotonic()
+
+        # Same found item scored again (e.g. edited post) — drop the old entry first
+        for i, (score, found_id, _) in enumerate(heap):
+            if found_id == match.id:
+                if score == match.similarity_score:
+                    return False
+                heap[i] = heap[-1]
+                heap.pop()
+                heapq.heapify(heap)
+                break
+
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+            return True
+        if entry[0] > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+            return True
+        return False
+
+    def top(self, lost_item_id: str) -> list[ScoredMatch]:
+        """Current top-K, best first."""
+        heap = self._heaps.get(lost_item_id, [])
+        return [m for _, _, m in sorted(heap, key=lambda e: e[0], reverse=True)]
+
+    def retain(self, lost_item_ids: set[str], as_of: float) -> None:
+        """
+        Forget lost items that are no longer active (resolved or deleted).
+        `lost_item_ids` is the active list as queried at `as_of` (time.monotonic());
+        heaps updated since then are kept — their lost item may be newer than the list.
+        """
+        for lost_item_id in self._heaps.keys() - lost_item_ids:
+            if self._touched[lost_item_id] < as_of:
+                del self._heaps[lost_item_id]
+                del self._touched[lost_item_id]
+
+    def __len__(self) -> int:
+        return len(self._heaps)
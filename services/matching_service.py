@@ -8,21 +8,36 @@ Model: llama-3.1-8b-instant
 
 Scoring per pair:
   Text     (50%) — Groq/LLaMA reads title / description / category
+                   (two-phase: score-only prompt for every pair, then
+                    explanations for the final top-N only)
   Image    (20%) — neutral 50 (Groq doesn't support vision)
   Location (20%) — keyword token overlap
   Time     (10%) — exponential decay (72h half-life)
+
+The groq SDK is imported when the client is first needed (or by
+`warm_up()` in a worker thread) to keep pod start fast.
 """
 
 import asyncio
+import importlib
 import json
 import logging
 import re
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from hashlib import sha1
 from math import exp
-
-from groq import AsyncGroq
+from typing import TYPE_CHECKING, Awaitable, Callable
 
 from config import settings
-from models.item import LostItemRequest, FoundItem, MatchResult, ScoreBreakdown
+from models.item import LostItemRequest, FoundItem, ScoredMatch
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.match_index import MatchIndex
+from services.scheduler import DeadlineExceeded, MatchScheduler, Priority, Reservation
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +45,7 @@ _SYSTEM_PROMPT = """You are an AI assistant for LGUINAH, a Lost & Found system a
 You compare lost and found items and estimate how likely they are the same object.
 Respond ONLY with valid JSON. No markdown, no explanation outside JSON."""
 
-_TEXT_PROMPT_TEMPLATE = """Compare these two items and estimate how likely they are the same object.
-
-LOST ITEM:
+_PAIR_BLOCK = """LOST ITEM:
 - Title: {lost_title}
 - Category: {lost_category}
 - Description: {lost_description}
@@ -42,24 +55,95 @@ FOUND ITEM:
 - Title: {found_title}
 - Category: {found_category}
 - Description: {found_description}
-- Location: {found_location}
-
-Respond ONLY with this JSON (no other text):
-{{"score": <integer 0-100>, "explanation": "<one short sentence>"}}
+- Location: {found_location}"""
 
-Scoring:
+_SCORING_GUIDE = """Scoring:
 85-100 = Almost certainly the same item
 60-84  = Probably the same item
 40-59  = Possibly the same item
 0-39   = Unlikely the same item"""
 
+_TEXT_PROMPT_TEMPLATE = f"""Compare these two items and estimate how likely they are the same object.
+
+{_PAIR_BLOCK}
+
+Respond ONLY with this JSON (no other text):
+{{{{"score": <integer 0-100>, "explanation": "<one short sentence>"}}}}
+
+{_SCORING_GUIDE}"""
+
+# Phase one of two-phase scoring — a handful of output tokens per pair
+_SCORE_PROMPT_TEMPLATE = f"""Compare these two items and estimate how likely they are the same object.
+
+{_PAIR_BLOCK}
+
+Respond ONLY with this JSON (no other text):
+{{{{"score": <integer 0-100>}}}}
+
+{_SCORING_GUIDE}"""
+
+# Phase two — one call explains every item in the final top-N
+_EXPLAIN_PROMPT_TEMPLATE = """A user lost this item:
+- Title: {lost_title}
+- Category: {lost_category}
+- Description: {lost_description}
+- Location: {lost_location}
+
+These found items were ranked as possible matches:
+{found_list}
+
+For each found item, in the same order, write one short sentence explaining why it may be the lost item.
+Respond ONLY with this JSON (no other text):
+{{"explanations": ["<sentence for item 1>", "<sentence for item 2>", ...]}}"""
+
+_SCORE_MAX_TOKENS        = 10    # {"score": 85}
+_EXPLAIN_TOKENS_PER_ITEM = 40
+
+_DEGRADED_EXPLANATION   = "AI temporarily unavailable — used keyword matching."
+_INCOMPLETE_EXPLANATION = "Not scored by AI within the time budget — keyword estimate."
+_FALLBACK_EXPLANATION   = "AI matched this item."
+
+
+def _tokenize(text: str) -> set[str]:
+    return set(re.sub(r'[^\w\s]', '', text.lower()).split())
+
 
 class MatchingService:
 
-    def __init__(self):
-        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
-        self.model  = settings.GROQ_MODEL
-        logger.info(f"✅ Groq client ready — model: {self.model}")
+    def __init__(self, scheduler: MatchScheduler):
+        self._client:  "AsyncGroq | None" = None
+        self.model     = settings.GROQ_MODEL
+        self.scheduler = scheduler
+        self.breaker   = CircuitBreaker("Groq")
+        self.warm      = False
+
+        # sha1(prompt) → (score, explanation); AI scores only, never keyword fallbacks.
+        # In two-phase mode the explanation is filled in once the pair is explained,
+        # so re-runs reuse it — a fresh wording would defeat /matches write skipping.
+        self._score_cache: OrderedDict[bytes, tuple[int, str]] = OrderedDict()
+        self._background:  set[asyncio.Task] = set()
+
+        # lost_item_id → current top-K, kept up to date for reverse matching
+        self.index = MatchIndex()
+
+    @property
+    def client(self) -> "AsyncGroq":
+        if self._client is None:
+            from groq import AsyncGroq
+
+            # SDK retries disabled — _text_score retries itself and consults the breaker
+            self._client = AsyncGroq(api_key=settings.GROQ_API_KEY, max_retries=0)
+            logger.info(f"✅ Groq client ready — model: {self.model}")
+        return self._client
+
+    async def warm_up(self) -> None:
+        """Import the SDK off the event loop and open the HTTPS connection to Groq."""
+        await asyncio.to_thread(importlib.import_module, "groq")
+        try:
+            await self.client.models.list()   # No tokens spent
+            self.warm = True
+        except Exception as e:
+            logger.warning(f"Groq warm-up failed — will connect on first use: {e}")
 
     # ─────────────────────────────────────────────────────────────────
     # PUBLIC
@@ -69,53 +153,242 @@ class MatchingService:
         self,
         lost_item:   LostItemRequest,
         found_items: list[FoundItem],
-    ) -> list[MatchResult]:
+        priority:    Priority = Priority.INTERACTIVE,
+        deadline:    float | None = None,
+        on_late:     Callable[[list[ScoredMatch]], Awaitable[None]] | None = None,
+    ) -> list[ScoredMatch]:
+        """
+        `deadline` (time.monotonic()) bounds how long we wait for the AI.
+        Candidates still unscored then are filled in with local keyword
+        scores and marked incomplete. AI calls already in flight keep running:
+        their scores land in the score cache, and once they are all in the
+        refined top-N is passed to `on_late` (e.g. to save it).
+        """
         candidates = found_items[: settings.MAX_FOUND_ITEMS_PER_MATCH]
+        if not candidates:
+            self.index.replace(lost_item.id, [])
+            return []
+
+        if deadline is not None:
+            # Most promising first — the scheduler serves each class in FIFO order
+            candidates = sorted(
+                candidates,
+                key     = lambda f: self._local_match(lost_item, f).similarity_score,
+                reverse = True,
+            )
+
+        # Run all comparisons concurrently — the scheduler caps actual Groq calls
+        tasks = [
+            asyncio.create_task(self._score_pair(lost_item, found, priority, deadline))
+            for found in candidates
+        ]
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+
+        matches   = self._rank(lost_item, candidates, tasks)
+        explained = True
+        if settings.TWO_PHASE_SCORING:
+            explained = await self._explain(lost_item, matches, priority, deadline)
+
+        if pending or not explained:
+            logger.info(f"⏱️  Deadline hit — {len(pending)} of {len(tasks)} pair(s) still scoring")
+            late = asyncio.create_task(
+                self._finish_late(lost_item, candidates, tasks, on_late)
+            )
+            self._background.add(late)
+            late.add_done_callback(self._background.discard)
+
+        self.index.replace(lost_item.id, matches)
+        return matches
+
+    async def match_found_item(
+        self,
+        found:         FoundItem,
+        lost_items:    list[LostItemRequest],
+        lost_items_at: float,
+        load_existing: Callable[[str], Awaitable[list[ScoredMatch]]],
+        priority:      Priority = Priority.INTERACTIVE,
+        reservation:   Reservation | None = None,
+    ) -> tuple[list[tuple[LostItemRequest, list[ScoredMatch], int]], list[str]]:
+        """
+        Reverse matching — score one new found item against the active lost items.
+
+        Only lost items that pass a local plausibility check are sent to the AI
+        (at most MAX_REVERSE_CANDIDATES, best keyword score first).
+
+        Returns (updated, failed):
+          updated — lost items whose top-K now includes `found`, each with its
+                    current top-K and the 1-based rank of `found` in it
+          failed  — ids of lost items that could not be scored, or whose stored
+                    matches could not be loaded; posting `found` again retries
+                    them (lost items already updated are not changed twice)
+
+        `lost_items_at` (time.monotonic()) is when `lost_items` was queried —
+        it may be a cached list. `load_existing(lost_item_id)` seeds the index
+        for lost items that have not been matched since this process started.
+        `reservation` (from admission) is resized to the calls actually needed.
+        """
+        self.index.retain({lost.id for lost in lost_items}, as_of=lost_items_at)
+
+        candidates = [
+            lost for lost in lost_items
+            if lost.userId != found.userId and self._plausible(lost, found)
+        ]
+        logger.info(
+            f"🔁 Found item '{found.title}' — {len(candidates)} of {len(lost_items)} lost item(s) plausible"
+        )
+        if len(candidates) > settings.MAX_REVERSE_CANDIDATES:
+            candidates.sort(key=lambda lost: self._local_match(lost, found).similarity_score, reverse=True)
+            logger.warning(
+                f"🔁 Scoring only the top {settings.MAX_REVERSE_CANDIDATES} of {len(candidates)} plausible "
+                f"lost items for '{found.title}' — raise MAX_REVERSE_CANDIDATES to cover the rest"
+            )
+            candidates = candidates[: settings.MAX_REVERSE_CANDIDATES]
+        if reservation is not None:
+            reservation.resize(2 * len(candidates))   # A score, and at most one explanation, each
+
+        results = await asyncio.gather(
+            *(self._score_pair(lost, found, priority) for lost in candidates),
+            return_exceptions=True,
+        )
+        scored: list[tuple[LostItemRequest, ScoredMatch]] = []
+        failed: list[str] = []
+        for lost, result in zip(candidates, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Scoring failed for {lost.id}: {result}")
+                failed.append(lost.id)
+            elif result.similarity_score >= settings.MIN_SCORE_THRESHOLD:
+                scored.append((lost, result))
+
+        # Seed the index from Firestore for lost items we have not seen yet
+        missing = [lost.id for lost, _ in scored if not self.index.has(lost.id)]
+        loaded  = await asyncio.gather(*(load_existing(i) for i in missing), return_exceptions=True)
+        for lost_item_id, existing in zip(missing, loaded):
+            if isinstance(existing, Exception):
+                # Not seeded with an empty heap — writing that would wipe the stored matches
+                logger.warning(f"Could not load current matches of {lost_item_id}: {existing}")
+                failed.append(lost_item_id)
+            elif not self.index.has(lost_item_id):   # May have been seeded while we waited
+                self.index.replace(lost_item_id, existing)
+
+        changed = [
+            (lost, match) for lost, match in scored
+            if self.index.has(lost.id) and self.index.offer(lost.id, match)
+        ]
+        if settings.TWO_PHASE_SCORING:
+            await asyncio.gather(*(self._explain(lost, [match], priority) for lost, match in changed))
+
+        # Other requests may have updated the index while we waited on the AI —
+        # report the current top-K, and leave out lost items `found` has since
+        # dropped out of (whoever pushed it out writes /matches for them)
+        updated = []
+        for lost, _ in changed:
+            top_k = self.index.top(lost.id)
+            rank  = next((i for i, m in enumerate(top_k, start=1) if m.id == found.id), None)
+            if rank is not None:
+                updated.append((lost, top_k, rank))
+        return updated, failed
 
-        # Run all comparisons concurrently
-        tasks   = [self._score_pair(lost_item, found) for found in candidates]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    # ─────────────────────────────────────────────────────────────────
+    # PRIVATE — RANKING
+    # ─────────────────────────────────────────────────────────────────
 
-        matches: list[MatchResult] = []
-        for found, result in zip(candidates, results):
-            if isinstance(result, Exception):
-                logger.warning(f"Scoring failed for {found.id}: {result}")
+    def _rank(
+        self, lost: LostItemRequest, candidates: list[FoundItem], tasks: list[asyncio.Task]
+    ) -> list[ScoredMatch]:
+        """Top-N above threshold; unfinished pairs fall back to their local score."""
+        scored: list[ScoredMatch] = []
+        for found, task in zip(candidates, tasks):
+            if not task.done():
+                scored.append(self._local_match(lost, found))
                 continue
-            score, breakdown, explanation = result
-            if score >= settings.MIN_SCORE_THRESHOLD:
-                matches.append(
-                    MatchResult(
-                        id               = found.id,
-                        userId           = found.userId,
-                        userName         = found.userName,
-                        userEmail        = found.userEmail,
-                        title            = found.title,
-                        description      = found.description,
-                        category         = found.category,
-                        location         = found.location,
-                        timestamp        = found.timestamp,
-                        imageURLs        = found.imageURLs,
-                        similarity_score = score,
-                        score_breakdown  = breakdown,
-                        ai_explanation   = explanation,
-                    )
-                )
-
+            error = task.exception()
+            if isinstance(error, DeadlineExceeded):
+                scored.append(self._local_match(lost, found))
+            elif error is not None:
+                logger.warning(f"Scoring failed for {found.id}: {error}")
+            else:
+                scored.append(task.result())
+
+        matches = [m for m in scored if m.similarity_score >= settings.MIN_SCORE_THRESHOLD]
         matches.sort(key=lambda m: m.similarity_score, reverse=True)
         return matches[: settings.MAX_MATCHES_RETURNED]
 
+    async def _finish_late(
+        self,
+        lost:       LostItemRequest,
+        candidates: list[FoundItem],
+        tasks:      list[asyncio.Task],
+        on_late:    Callable[[list[ScoredMatch]], Awaitable[None]] | None,
+    ) -> None:
+        """
+        Wait for in-flight calls after a deadline, then hand over the refined results.
+        Nobody is waiting on this any more — new LLM calls go in at batch priority.
+        """
+        await asyncio.wait(tasks)
+        try:
+            # Copies — the caller may still be serialising / saving the first results
+            matches = [replace(m) for m in self._rank(lost, candidates, tasks)]
+            self.index.replace(lost.id, matches)
+            if on_late is None:
+                return   # Late scores are already in the cache
+            if settings.TWO_PHASE_SCORING:
+                for m in matches:
+                    if m.ai_explanation == _FALLBACK_EXPLANATION:
+                        m.ai_explanation = ""   # Cut short by the deadline — explain again
+                await self._explain(lost, matches, Priority.BATCH)
+            await on_late(matches)
+        except Exception:
+            logger.exception(f"Late result handling failed for {lost.id}")
+
     # ─────────────────────────────────────────────────────────────────
     # PRIVATE — SCORING
     # ─────────────────────────────────────────────────────────────────
 
     async def _score_pair(
-        self, lost: LostItemRequest, found: FoundItem
-    ) -> tuple[int, ScoreBreakdown, str]:
+        self,
+        lost:     LostItemRequest,
+        found:    FoundItem,
+        priority: Priority,
+        deadline: float | None = None,
+    ) -> ScoredMatch:
+        text_score, explanation, degraded = await self._text_score(lost, found, priority, deadline)
+        return self._combine(lost, found, text_score, explanation, degraded=degraded)
+
+    def _plausible(self, lost: LostItemRequest, found: FoundItem) -> bool:
+        """
+        Cheap pre-filter for reverse matching: the pair could still reach
+        MIN_SCORE_THRESHOLD with a perfect text score, and shares either
+        the category or at least one title/description word.
+        """
+        best = self._combine(lost, found, 100, "").similarity_score
+        if best < settings.MIN_SCORE_THRESHOLD:
+            return False
+        if lost.category == found.category:
+            return True
+        return bool(
+            _tokenize(lost.title + " " + lost.description)
+            & _tokenize(found.title + " " + found.description)
+        )
 
-        text_score, explanation = await self._text_score(lost, found)
-        image_score             = 50   # Groq is text-only; neutral score
-        location_score          = self._location_score(lost.location, found.location)
-        time_score              = self._time_score(lost.timestamp, found.timestamp)
+    def _local_match(self, lost: LostItemRequest, found: FoundItem) -> ScoredMatch:
+        """No AI — used to order candidates and for pairs not scored before the deadline."""
+        return self._combine(
+            lost, found, self._keyword_score(lost, found), _INCOMPLETE_EXPLANATION, complete=False
+        )
+
+    def _combine(
+        self,
+        lost:        LostItemRequest,
+        found:       FoundItem,
+        text_score:  int,
+        explanation: str,
+        degraded:    bool = False,
+        complete:    bool = True,
+    ) -> ScoredMatch:
+        image_score    = 50   # Groq is text-only; neutral score
+        location_score = self._location_score(lost.location, found.location)
+        time_score     = self._time_score(lost.timestamp, found.timestamp)
 
         overall = (
             text_score       * settings.WEIGHT_TEXT
@@ -124,21 +397,79 @@ class MatchingService:
             + image_score    * settings.WEIGHT_IMAGE
         ) // 100
 
-        breakdown = ScoreBreakdown(
-            text_score     = text_score,
-            location_score = location_score,
-            time_score     = time_score,
-            image_score    = image_score,
+        return ScoredMatch(
+            found            = found,
+            similarity_score = overall,
+            text_score       = text_score,
+            location_score   = location_score,
+            time_score       = time_score,
+            image_score      = image_score,
+            ai_explanation   = explanation,
+            degraded         = degraded,
+            complete         = complete,
         )
-        return overall, breakdown, explanation
 
     # ── 1. Text — Groq / LLaMA ───────────────────────────────────────
 
     async def _text_score(
-        self, lost: LostItemRequest, found: FoundItem
-    ) -> tuple[int, str]:
+        self,
+        lost:     LostItemRequest,
+        found:    FoundItem,
+        priority: Priority,
+        deadline: float | None = None,
+    ) -> tuple[int, str, bool]:
+        """
+        Returns (score, explanation, degraded) — degraded means keyword fallback.
+        Raises DeadlineExceeded if no Groq call could start before `deadline`.
+        """
+        max_tokens = _SCORE_MAX_TOKENS if settings.TWO_PHASE_SCORING else 150
+
+        prompt = self._text_prompt(lost, found)
+        key    = sha1(prompt.encode("utf-8")).digest()
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            self._score_cache.move_to_end(key)
+            return cached[0], cached[1], False
+
+        # Breaker open — don't queue, retry or sleep: score locally right away
+        if not self.breaker.available():
+            return self._keyword_score(lost, found), _DEGRADED_EXPLANATION, True
+
+        for attempt in range(3):
+            try:
+                raw         = await self._complete(prompt, max_tokens, priority, deadline)
+                data        = self._parse_json(raw)
+                score       = max(0, min(100, int(data["score"])))
+                explanation = data.get("explanation", "")
+                self._cache_score(key, score, explanation)
+                return score, explanation, False
+
+            except CircuitOpenError:
+                return self._keyword_score(lost, found), _DEGRADED_EXPLANATION, True
+
+            except DeadlineExceeded:
+                raise
+
+            except Exception as e:
+                err = str(e)
+                retryable = "429" in err or "503" in err or "rate" in err.lower()
+                if retryable and attempt < 2 and self.breaker.available():
+                    wait = (attempt + 1) * 5
+                    if deadline is not None and time.monotonic() + wait > deadline:
+                        raise DeadlineExceeded("no time left to retry")
+                    logger.warning(f"Groq rate limited — retrying in {wait}s (attempt {attempt+1}/3)")
+                    await asyncio.sleep(wait)
+                else:
+                    logger.warning(f"Text scoring error: {e}")
+                    return self._keyword_score(lost, found), "AI unavailable — used keyword matching.", True
+
+        return self._keyword_score(lost, found), "AI unavailable after retries — used keyword matching.", True
 
-        prompt = _TEXT_PROMPT_TEMPLATE.format(
+    @staticmethod
+    def _text_prompt(lost: LostItemRequest, found: FoundItem) -> str:
+        """Phase-one (or single-phase) prompt; its sha1 keys the score cache."""
+        template = _SCORE_PROMPT_TEMPLATE if settings.TWO_PHASE_SCORING else _TEXT_PROMPT_TEMPLATE
+        return template.format(
             lost_title        = lost.title,
             lost_category     = lost.category.value,
             lost_description  = lost.description,
@@ -149,34 +480,126 @@ class MatchingService:
             found_location    = found.location or "not specified",
         )
 
-        for attempt in range(3):
+    def _cache_score(self, key: bytes, score: int, explanation: str) -> None:
+        self._score_cache[key] = (score, explanation)
+        self._score_cache.move_to_end(key)
+        while len(self._score_cache) > settings.SCORE_CACHE_SIZE:
+            self._score_cache.popitem(last=False)
+
+    async def _complete(
+        self,
+        prompt:     str,
+        max_tokens: int,
+        priority:   Priority,
+        deadline:   float | None = None,
+    ) -> str:
+        """One Groq chat completion, run through the scheduler and the circuit breaker."""
+        if not self.breaker.available():
+            raise CircuitOpenError("Groq circuit is open")
+
+        async def call():
+            # Re-checked once a slot is granted — the breaker may have opened meanwhile
+            ticket = self.breaker.acquire()
+            if ticket is None:
+                raise CircuitOpenError("Groq circuit is open")
+
+            started = time.monotonic()
             try:
                 response = await self.client.chat.completions.create(
                     model       = self.model,
                     temperature = 0.1,
-                    max_tokens  = 150,
+                    max_tokens  = max_tokens,
                     messages    = [
                         {"role": "system", "content": _SYSTEM_PROMPT},
                         {"role": "user",   "content": prompt},
                     ],
                 )
-                raw         = response.choices[0].message.content.strip()
-                data        = self._parse_json(raw)
-                score       = max(0, min(100, int(data["score"])))
-                explanation = data.get("explanation", "")
-                return score, explanation
+            except asyncio.CancelledError:
+                self.breaker.abandon(ticket)
+                raise
+            except Exception:
+                self.breaker.record(ticket, ok=False, latency=time.monotonic() - started)
+                raise
+            self.breaker.record(ticket, ok=True, latency=time.monotonic() - started)
+            return response
 
-            except Exception as e:
-                err = str(e)
-                if ("429" in err or "503" in err or "rate" in err.lower()) and attempt < 2:
-                    wait = (attempt + 1) * 5
-                    logger.warning(f"Groq rate limited — retrying in {wait}s (attempt {attempt+1}/3)")
-                    await asyncio.sleep(wait)
-                else:
-                    logger.warning(f"Text scoring error: {e}")
-                    return self._keyword_score(lost, found), "AI unavailable — used keyword matching."
+        response = await self.scheduler.run(priority, call, deadline)
+        return response.choices[0].message.content.strip()
+
+    # ── 1b. Explanations — phase two, final top-N only ───────────────
+
+    async def _explain(
+        self,
+        lost:     LostItemRequest,
+        matches:  list[ScoredMatch],
+        priority: Priority,
+        deadline: float | None = None,
+    ) -> bool:
+        """
+        Fill `ai_explanation` in place for AI-scored matches (keyword fallbacks
+        already have one). Returns False if `deadline` cut the explanations short.
+        """
+        pending = [m for m in matches if not m.ai_explanation]
+        if not pending:
+            return True
+        groups = [pending] if settings.BATCH_EXPLANATIONS else [[m] for m in pending]
+        work   = asyncio.gather(*(self._explain_group(lost, g, priority, deadline) for g in groups))
+
+        if deadline is None:
+            await work
+            return True
+        try:
+            await asyncio.wait_for(work, timeout=max(0.0, deadline - time.monotonic()))
+            return True
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            for m in pending:
+                m.ai_explanation = m.ai_explanation or _FALLBACK_EXPLANATION
+            return False
+
+    async def _explain_group(
+        self,
+        lost:     LostItemRequest,
+        group:    list[ScoredMatch],
+        priority: Priority,
+        deadline: float | None = None,
+    ) -> None:
+        found_list = "\n".join(
+            f"{i}. Title: {m.found.title} | Category: {m.found.category.value} | "
+            f"Description: {m.found.description} | Location: {m.found.location or 'not specified'}"
+            for i, m in enumerate(group, start=1)
+        )
+        prompt = _EXPLAIN_PROMPT_TEMPLATE.format(
+            lost_title       = lost.title,
+            lost_category    = lost.category.value,
+            lost_description = lost.description,
+            lost_location    = lost.location or "not specified",
+            found_list       = found_list,
+        )
 
-        return self._keyword_score(lost, found), "AI unavailable after retries — used keyword matching."
+        explanations: list = []
+        try:
+            raw          = await self._complete(
+                prompt, _EXPLAIN_TOKENS_PER_ITEM * len(group) + 20, priority, deadline
+            )
+            explanations = self._parse_json(raw).get("explanations", [])
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"Explanation error: {e}")
+
+        for i, m in enumerate(group):
+            text = explanations[i] if i < len(explanations) and isinstance(explanations[i], str) else ""
+            text = text.strip()
+            m.ai_explanation = text or _FALLBACK_EXPLANATION
+            if text:
+                self._cache_explanation(lost, m, text)
+
+    def _cache_explanation(self, lost: LostItemRequest, m: ScoredMatch, explanation: str) -> None:
+        """Attach the explanation to the cached score it was written for."""
+        key    = sha1(self._text_prompt(lost, m.found).encode("utf-8")).digest()
+        cached = self._score_cache.get(key)
+        if cached is not None and cached[0] == m.text_score:
+            self._score_cache[key] = (cached[0], explanation)
 
     # ── 2. Location — keyword overlap ────────────────────────────────
 
@@ -203,10 +626,8 @@ class MatchingService:
 
     @staticmethod
     def _keyword_score(lost: LostItemRequest, found: FoundItem) -> int:
-        def tokenize(t: str) -> set[str]:
-            return set(re.sub(r'[^\w\s]', '', t.lower()).split())
-        lt             = tokenize(lost.title  + " " + lost.description)
-        ft             = tokenize(found.title + " " + found.description)
+        lt             = _tokenize(lost.title  + " " + lost.description)
+        ft             = _tokenize(found.title + " " + found.description)
         category_bonus = 20 if lost.category == found.category else 0
         union          = len(lt | ft)
         overlap        = len(lt & ft)
@@ -0,0 +1,279 @@
+"""
+MatchScheduler — one gate in front of every Groq call
+
+Interactive /match calls and batch re-runs share the same Groq quota.
+Every LLM call goes through `run()`, which hands out a fixed number of
+concurrency slots using weighted-fair queueing between priority classes:
+
+  INTERACTIVE (weight 8) — a user is waiting on the HTTP response
+  BATCH       (weight 1) — admin re-runs, nobody is waiting
+
+Admission control:
+  - interactive requests reserve their expected LLM calls when admitted and
+    are shed (429) once the outstanding reservations would exceed the limit
+  - batch runs become background jobs (202 + job id), capped in number
+  - calls carrying a deadline leave the queue when it passes (DeadlineExceeded)
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from contextlib import suppress
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_WAIT_SAMPLES = 1000   # Recent wait times kept per class for p50 / p99
+_JOB_HISTORY  = 50     # Finished batch jobs kept for status lookups
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"
+    BATCH       = "batch"
+
+
+class AdmissionRejected(Exception):
+    """Raised when the scheduler is too busy to accept more work."""
+
+    def __init__(self, priority: Priority, reason: str):
+        super().__init__(reason)
+        self.priority = priority
+
+
+class DeadlineExceeded(Exception):
+    """The caller's latency budget ran out before an LLM slot was granted."""
+
+
+class Reservation:
+    """Interactive LLM calls an admitted request may still make. Release when it returns."""
+
+    __slots__ = ("_scheduler", "calls")
+
+    def __init__(self, scheduler: "MatchScheduler", calls: int):
+        self._scheduler = scheduler
+        self.calls      = calls
+
+    def resize(self, calls: int) -> None:
+        """Adjust once the request knows how much work it actually has."""
+        self._scheduler._reserved += calls - self.calls
+        self.calls = calls
+
+    def release(self) -> None:
+        self.resize(0)
+
+
+class MatchScheduler:
+
+    def __init__(self):
+        self.max_concurrency = settings.LLM_MAX_CONCURRENCY
+        self.weights = {
+            Priority.INTERACTIVE: settings.WEIGHT_INTERACTIVE,
+            Priority.BATCH:       settings.WEIGHT_BATCH,
+        }
+        self.max_interactive_queue_depth = settings.MAX_INTERACTIVE_QUEUE_DEPTH
+        self._reserved = 0   # Interactive LLM calls reserved by admitted, unfinished requests
+
+        self._active = 0
+        self._queues: dict[Priority, deque[asyncio.Future]] = {p: deque() for p in Priority}
+        self._vtime:  dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._vclock = 0.0
+
+        self._waits:      dict[Priority, deque[float]] = {p: deque(maxlen=_WAIT_SAMPLES) for p in Priority}
+        self._dispatched: dict[Priority, int] = {p: 0 for p in Priority}
+        self._shed:       dict[Priority, int] = {p: 0 for p in Priority}
+        self._expired:    dict[Priority, int] = {p: 0 for p in Priority}
+
+        self._jobs:       dict[str, dict] = {}
+        self._job_slot    = asyncio.Semaphore(1)   # Batch jobs run one at a time
+        self._job_tasks:  set[asyncio.Task] = set()
+
+        logger.info(
+            f"✅ Scheduler ready — {self.max_concurrency} LLM slots, "
+            f"weights {settings.WEIGHT_INTERACTIVE}:{settings.WEIGHT_BATCH}"
+        )
+
+    # ─────────────────────────────────────────────────────────────────
+    # ADMISSION
+    # ─────────────────────────────────────────────────────────────────
+
+    def admit(self, calls: int) -> Reservation:
+        """
+        Reserve `calls` interactive LLM calls, or raise AdmissionRejected if the
+        calls already reserved by admitted requests leave no room. Reserving at
+        admission (not peeking at the queue) holds under a burst, when none of
+        the admitted requests has queued anything yet.
+
+        Batch work is admitted per job instead (`submit_job`): jobs run one at
+        a time and match lost items one after another, so the batch queue
+        never holds more than one lost item's worth of calls.
+        """
+        # A lone request is always admitted, however large
+        if self._reserved and self._reserved + calls > self.max_interactive_queue_depth:
+            self._shed[Priority.INTERACTIVE] += 1
+            logger.warning(f"🚦 Shedding interactive request — {self._reserved} LLM calls reserved")
+            raise AdmissionRejected(Priority.INTERACTIVE, f"{self._reserved} interactive calls already reserved")
+        self._reserved += calls
+        return Reservation(self, calls)
+
+    # ─────────────────────────────────────────────────────────────────
+    # LLM SLOTS — weighted-fair queueing
+    # ─────────────────────────────────────────────────────────────────
+
+    async def run(
+        self,
+        priority: Priority,
+        fn:       Callable[[], Awaitable[Any]],
+        deadline: float | None = None,
+    ) -> Any:
+        """
+        Wait for a slot under `priority`, then await `fn()` while holding it.
+        `deadline` (time.monotonic()) bounds the wait only — a call that got
+        its slot in time is allowed to finish.
+        """
+        enqueued = time.monotonic()
+        if deadline is None:
+            await self._acquire(priority)
+        else:
+            try:
+                await asyncio.wait_for(self._acquire(priority), timeout=max(0.0, deadline - enqueued))
+            except asyncio.TimeoutError:
+                self._expired[priority] += 1
+                raise DeadlineExceeded(f"no {priority.value} slot before the deadline")
+        self._waits[priority].append(time.monotonic() - enqueued)
+        try:
+            return await fn()
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority) -> None:
+        queue = self._queues[priority]
+        if not queue:
+            # Class was idle — don't let it bank credit from the idle period
+            self._vtime[priority] = max(self._vtime[priority], self._vclock)
+
+        if self._active < self.max_concurrency and not any(self._queues.values()):
+            self._grant(priority)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()   # Slot was granted just as we got cancelled
+            else:
+                with suppress(ValueError):
+                    queue.remove(future)
+            raise
+
+    def _grant(self, priority: Priority) -> None:
+        self._active += 1
+        self._dispatched[priority] += 1
+        self._vclock = self._vtime[priority]
+        self._vtime[priority] += 1 / self.weights[priority]
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._active < self.max_concurrency:
+            waiting = [p for p in Priority if self._queues[p]]
+            if not waiting:
+                return
+            priority = min(waiting, key=lambda p: self._vtime[p])
+            future   = self._queues[priority].popleft()
+            if future.done():
+                continue   # Cancelled while queued
+            self._grant(priority)
+            future.set_result(None)
+
+    # ─────────────────────────────────────────────────────────────────
+    # BATCH JOBS
+    # ─────────────────────────────────────────────────────────────────
+
+    def submit_job(self, fn: Callable[[], Awaitable[dict]]) -> str:
+        """Queue a background batch job. Returns its job id."""
+        pending = sum(1 for j in self._jobs.values() if j["status"] in ("queued", "running"))
+        if pending >= settings.MAX_PENDING_BATCH_JOBS:
+            self._shed[Priority.BATCH] += 1
+            raise AdmissionRejected(Priority.BATCH, f"{pending} batch job(s) already pending")
+
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = {
+            "job_id":       job_id,
+            "status":       "queued",
+            "submitted_at": time.time(),
+            "started_at":   None,
+            "finished_at":  None,
+            "result":       None,
+            "error":        None,
+        }
+        task = asyncio.create_task(self._run_job(job_id, fn))
+        self._job_tasks.add(task)
+        task.add_done_callback(self._job_tasks.discard)
+        self._trim_jobs()
+        return job_id
+
+    def get_job(self, job_id: str) -> dict | None:
+        return self._jobs.get(job_id)
+
+    async def _run_job(self, job_id: str, fn: Callable[[], Awaitable[dict]]) -> None:
+        job = self._jobs[job_id]
+        async with self._job_slot:
+            job["status"]     = "running"
+            job["started_at"] = time.time()
+            try:
+                job["result"] = await fn()
+                job["status"] = "done"
+            except Exception as e:
+                logger.exception(f"Batch job {job_id} failed")
+                job["error"]  = str(e)
+                job["status"] = "failed"
+            finally:
+                job["finished_at"] = time.time()
+
+    def _trim_jobs(self) -> None:
+        finished = [j for j in self._jobs.values() if j["status"] in ("done", "failed")]
+        for job in sorted(finished, key=lambda j: j["finished_at"])[:-_JOB_HISTORY]:
+            del self._jobs[job["job_id"]]
+
+    # ─────────────────────────────────────────────────────────────────
+    # STATS
+    # ─────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        classes = {}
+        for p in Priority:
+            waits = sorted(self._waits[p])
+            classes[p.value] = {
+                "queue_depth":  len(self._queues[p]),
+                "dispatched":   self._dispatched[p],
+                "shed":         self._shed[p],
+                "expired":      self._expired[p],
+                "wait_p50_ms":  int(_percentile(waits, 0.50) * 1000),
+                "wait_p99_ms":  int(_percentile(waits, 0.99) * 1000),
+                "wait_max_ms":  int((waits[-1] if waits else 0.0) * 1000),
+            }
+        return {
+            "active_slots":   self._active,
+            "max_slots":      self.max_concurrency,
+            "reserved_calls": self._reserved,
+            "classes":        classes,
+            "jobs": {
+                status: sum(1 for j in self._jobs.values() if j["status"] == status)
+                for status in ("queued", "running", "done", "failed")
+            },
+        }
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
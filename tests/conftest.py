@@ -0,0 +1,119 @@
+"""
+Shared test fixtures — fake clock and fake Groq client.
+
+Run from the repo root:
+    python -m pytest -q
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Required settings — set before `config` is imported by any test module
+os.environ.setdefault("GROQ_API_KEY",        "test-key")
+os.environ.setdefault("FIREBASE_PROJECT_ID", "test-project")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+from models.item import FoundItem, ItemCategory, LostItemRequest  # noqa: E402
+
+
+class FakeClock:
+    """Stands in for time.monotonic() — tests move it forward by hand."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content: str):
+        self.message = _Message(content)
+
+
+class _Response:
+    def __init__(self, content: str):
+        self.choices = [_Choice(content)]
+
+
+class FakeGroq:
+    """
+    Minimal AsyncGroq stand-in: `client.chat.completions.create(**kw)`.
+    Score prompts get `score_for(prompt)`; explanation prompts get one
+    sentence per listed item. Set `error` to make every call raise it.
+    """
+
+    def __init__(self, score: int = 90):
+        self.score = score
+        self.error: Exception | None = None
+        self.calls: list[str] = []   # "score" / "explain", in call order
+        self.chat        = self
+        self.completions = self
+
+    async def create(self, **kwargs) -> _Response:
+        prompt = kwargs["messages"][-1]["content"]
+        kind   = "explain" if '"explanations"' in prompt else "score"
+        self.calls.append(kind)
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        if kind == "explain":
+            n = prompt.count("| Category:")
+            return _Response('{"explanations": [%s]}' % ", ".join(f'"reason {i}"' for i in range(n)))
+        return _Response('{"score": %d}' % self.score)
+
+
+@pytest.fixture
+def fake_groq() -> FakeGroq:
+    return FakeGroq()
+
+
+@pytest.fixture
+def tune(monkeypatch):
+    """Override settings for one test: tune(LLM_MAX_CONCURRENCY=1, ...)."""
+    def _tune(**overrides):
+        for name, value in overrides.items():
+            monkeypatch.setattr(settings, name, value)
+    return _tune
+
+
+def make_found(i: int, **overrides) -> FoundItem:
+    fields = dict(
+        id          = f"found-{i}",
+        userId      = f"finder-{i}",
+        userName    = "Finder",
+        userEmail   = "finder@estin.dz",
+        title       = "black wallet",
+        description = f"leather wallet number {i}",
+        category    = ItemCategory.DOCUMENTS,
+        location    = "library",
+        timestamp   = 1764977468368,
+    )
+    return FoundItem(**(fields | overrides))
+
+
+def make_lost(item_id: str = "lost-1", **overrides) -> LostItemRequest:
+    fields = dict(
+        id          = item_id,
+        userId      = f"owner-{item_id}",
+        userName    = "Owner",
+        userEmail   = "owner@estin.dz",
+        title       = "black wallet",
+        description = "leather wallet with my student card",
+        category    = ItemCategory.DOCUMENTS,
+        location    = "library",
+        timestamp   = 1764977468368,
+    )
+    return LostItemRequest(**(fields | overrides))
@@ -0,0 +1,190 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import BreakerState, CircuitBreaker
+from services.matching_service import MatchingService
+from services.scheduler import MatchScheduler
+from tests.conftest import FakeClock, make_found, make_lost
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def breaker(tune, clock) -> CircuitBreaker:
+    tune(
+        BREAKER_WINDOW            = 10,
+        BREAKER_MIN_CALLS         = 4,
+        BREAKER_ERROR_RATE        = 0.5,
+        BREAKER_SLOW_CALL_SECONDS = 5.0,
+        BREAKER_OPEN_SECONDS      = 30.0,
+        BREAKER_PROBE_CALLS       = 2,
+    )
+    return CircuitBreaker("test")
+
+
+def _call(breaker: CircuitBreaker, ok: bool = True, latency: float = 0.1) -> None:
+    ticket = breaker.acquire()
+    assert ticket is not None
+    breaker.record(ticket, ok=ok, latency=latency)
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    for _ in range(4):
+        _call(breaker, ok=False)
+    assert breaker.state == BreakerState.OPEN
+
+
+# ── Closed → open ───────────────────────────────────────────────────
+
+def test_needs_min_calls_before_tripping(breaker):
+    for _ in range(3):
+        _call(breaker, ok=False)
+    assert breaker.state == BreakerState.CLOSED
+    _call(breaker, ok=False)
+    assert breaker.state == BreakerState.OPEN
+
+
+def test_trips_on_error_rate_over_the_window(breaker):
+    for ok in (True, True, False, True, True, False, True, False, False):
+        _call(breaker, ok=ok)
+    assert breaker.state == BreakerState.CLOSED   # 4 of 9 bad
+    _call(breaker, ok=False)
+    assert breaker.state == BreakerState.OPEN     # 5 of 10
+
+
+def test_slow_calls_count_as_failures(breaker):
+    for _ in range(4):
+        _call(breaker, ok=True, latency=6.0)
+    assert breaker.state == BreakerState.OPEN
+
+
+# ── Open → half-open → closed / open ────────────────────────────────
+
+def test_open_rejects_until_cooled_down(breaker, clock):
+    _trip(breaker)
+    assert not breaker.available()
+    assert breaker.acquire() is None
+    assert breaker.stats()["rejected"] == 1
+
+    clock.advance(29.9)
+    assert breaker.acquire() is None
+
+    clock.advance(0.1)
+    assert breaker.available()
+    assert breaker.acquire() is not None
+    assert breaker.state == BreakerState.HALF_OPEN
+
+
+def test_half_open_admits_only_probe_calls(breaker, clock):
+    _trip(breaker)
+    clock.advance(30)
+
+    first  = breaker.acquire()
+    second = breaker.acquire()
+    assert first is not None and second is not None
+    assert breaker.acquire() is None            # Both probe slots in flight
+    assert not breaker.available()
+
+    breaker.record(first, ok=True, latency=0.1)
+    assert breaker.state == BreakerState.HALF_OPEN
+    breaker.record(second, ok=True, latency=0.1)
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.stats()["recent_calls"] == 0  # Fresh window after recovery
+
+
+def test_failed_probe_reopens(breaker, clock):
+    _trip(breaker)
+    clock.advance(30)
+
+    probe = breaker.acquire()
+    breaker.record(probe, ok=False, latency=0.1)
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.stats()["opened"] == 2
+    assert breaker.acquire() is None            # Cool-down starts over
+
+
+def test_abandoned_probe_frees_its_slot(breaker, clock):
+    _trip(breaker)
+    clock.advance(30)
+
+    first = breaker.acquire()
+    breaker.acquire()
+    assert breaker.acquire() is None
+    breaker.abandon(first)
+    assert breaker.acquire() is not None
+
+
+# ── Stale tickets ───────────────────────────────────────────────────
+
+def test_outcomes_from_a_previous_state_are_ignored(breaker, clock):
+    slow = breaker.acquire()                    # Started while closed…
+    _trip(breaker)
+    clock.advance(30)
+    probe = breaker.acquire()                   # …breaker is now half-open
+
+    breaker.record(slow, ok=False, latency=60)  # Must not fail the probe round
+    assert breaker.state == BreakerState.HALF_OPEN
+    breaker.abandon(slow)                       # Nor free a probe slot it never held
+    breaker.acquire()
+    assert breaker.acquire() is None
+
+    breaker.record(probe, ok=True, latency=0.1)
+    assert breaker.state == BreakerState.HALF_OPEN
+
+
+# ── With MatchingService — Groq outage ──────────────────────────────
+
+def test_outage_falls_back_to_keywords_then_skips_groq(tune, clock, fake_groq, monkeypatch):
+    tune(
+        LLM_MAX_CONCURRENCY       = 8,
+        BREAKER_WINDOW            = 20,
+        BREAKER_MIN_CALLS         = 10,
+        BREAKER_ERROR_RATE        = 0.5,
+        BREAKER_SLOW_CALL_SECONDS = 5.0,
+        BREAKER_OPEN_SECONDS      = 30.0,
+        TWO_PHASE_SCORING         = True,
+    )
+    backoffs: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds: float, *args):
+        if seconds:
+            backoffs.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    fake_groq.error = RuntimeError("Error code: 503 - upstream unavailable")
+
+    async def scenario():
+        matcher         = MatchingService(MatchScheduler())
+        matcher._client = fake_groq
+        found           = [make_found(i) for i in range(20)]
+
+        first          = await matcher.find_matches(make_lost("lost-1"), found)
+        calls_first    = len(fake_groq.calls)
+        backoffs_first = len(backoffs)
+        second         = await matcher.find_matches(make_lost("lost-2", description="brown wallet"), found)
+        return matcher, first, calls_first, backoffs_first, second
+
+    matcher, first, calls_first, backoffs_first, second = asyncio.run(scenario())
+
+    # First request: the breaker trips on its first failed round, so each pair
+    # waits out at most one 5 s back-off before falling back to keywords
+    assert matcher.breaker.state == BreakerState.OPEN
+    assert set(backoffs) == {5}
+    assert len(backoffs) <= 20
+    assert calls_first <= 20                     # No second retry once the breaker opened
+    assert first and all(m.degraded for m in first)
+
+    # Later requests never reach Groq and never back off
+    assert len(fake_groq.calls) == calls_first
+    assert len(backoffs) == backoffs_first
+    assert second and all(m.degraded for m in second)
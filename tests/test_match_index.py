@@ -0,0 +1,172 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from models.item import ScoredMatch
+from services import match_index
+from services.match_index import MatchIndex
+from services.matching_service import MatchingService
+from services.scheduler import MatchScheduler
+from tests.conftest import FakeClock, make_found, make_lost
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(match_index, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def index(tune, clock) -> MatchIndex:
+    tune(MAX_MATCHES_RETURNED=3)
+    return MatchIndex()
+
+
+def _match(i: int, score: int) -> ScoredMatch:
+    return ScoredMatch(
+        found            = make_found(i),
+        similarity_score = score,
+        text_score       = score,
+        location_score   = 0,
+        time_score       = 0,
+        image_score      = 50,
+        ai_explanation   = "",
+    )
+
+
+def _ids(matches: list[ScoredMatch]) -> list[str]:
+    return [m.id for m in matches]
+
+
+# ── replace / top ───────────────────────────────────────────────────
+
+def test_replace_keeps_the_best_k_best_first(index):
+    index.replace("lost-1", [_match(i, s) for i, s in enumerate([50, 90, 70, 60, 80])])
+    assert _ids(index.top("lost-1")) == ["found-1", "found-4", "found-2"]
+
+
+def test_unknown_lost_item_has_empty_top(index):
+    assert not index.has("lost-1")
+    assert index.top("lost-1") == []
+
+
+# ── offer ───────────────────────────────────────────────────────────
+
+def test_offer_fills_then_only_accepts_better_matches(index):
+    index.replace("lost-1", [_match(1, 60), _match(2, 70)])
+    assert index.offer("lost-1", _match(3, 50))          # Room left
+    assert not index.offer("lost-1", _match(4, 50))      # Ties the weakest — no change
+    assert not index.offer("lost-1", _match(5, 40))
+    assert index.offer("lost-1", _match(6, 65))          # Evicts the 50
+    assert _ids(index.top("lost-1")) == ["found-2", "found-6", "found-1"]
+
+
+def test_offer_rescored_item_replaces_its_old_entry(index):
+    index.replace("lost-1", [_match(1, 60), _match(2, 70), _match(3, 80)])
+    assert not index.offer("lost-1", _match(1, 60))      # Same score again — no change
+    assert index.offer("lost-1", _match(1, 90))          # Edited post scores higher
+    assert _ids(index.top("lost-1")) == ["found-1", "found-3", "found-2"]
+    assert len(index.top("lost-1")) == 3                 # No duplicate entry
+
+
+# ── retain ──────────────────────────────────────────────────────────
+
+def test_retain_drops_inactive_lost_items(index, clock):
+    index.replace("resolved", [_match(1, 60)])
+    index.replace("active",   [_match(2, 60)])
+    clock.advance(1)
+
+    index.retain({"active"}, as_of=clock())
+    assert not index.has("resolved")
+    assert index.has("active")
+    assert len(index) == 1
+
+
+def test_retain_keeps_heaps_newer_than_the_list(index, clock):
+    queried_at = clock()                                  # Cached list queried…
+    clock.advance(10)
+    index.replace("just-posted", [_match(1, 60)])         # …then /match built a heap
+
+    index.retain(set(), as_of=queried_at)
+    assert index.has("just-posted")
+
+
+# ── MatchingService.match_found_item ────────────────────────────────
+
+def _matcher(tune, fake_groq) -> MatchingService:
+    tune(MAX_MATCHES_RETURNED=1, MIN_SCORE_THRESHOLD=40, TWO_PHASE_SCORING=True)
+    matcher         = MatchingService(MatchScheduler())
+    matcher._client = fake_groq
+    return matcher
+
+
+def test_found_item_pushed_out_while_explaining_is_left_out(tune, fake_groq):
+    async def scenario():
+        matcher = _matcher(tune, fake_groq)
+        lost    = make_lost("lost-1")
+
+        async def load_existing(_):
+            return []
+
+        explaining   = asyncio.Event()
+        resume       = asyncio.Event()
+        real_explain = matcher._explain
+
+        async def slow_explain(*args, **kwargs):
+            explaining.set()
+            await resume.wait()
+            return await real_explain(*args, **kwargs)
+
+        matcher._explain = slow_explain
+        first = asyncio.create_task(
+            matcher.match_found_item(make_found(1), [lost], 0.0, load_existing)
+        )
+        await explaining.wait()
+        matcher.index.replace(lost.id, [_match(2, 99)])   # e.g. a batch run finished meanwhile
+        resume.set()
+        return await first
+
+    updated, failed = asyncio.run(scenario())
+    assert updated == [] and failed == []
+
+
+def test_failed_seed_is_reported_and_retry_covers_it(tune, fake_groq):
+    async def scenario():
+        matcher = _matcher(tune, fake_groq)
+        lost    = [make_lost("lost-1"), make_lost("lost-2")]
+        broken  = {"lost-2"}
+
+        async def load_existing(lost_item_id):
+            if lost_item_id in broken:
+                raise RuntimeError("Firestore unavailable")
+            return []
+
+        found = make_found(1)
+        first = await matcher.match_found_item(found, lost, 0.0, load_existing)
+        broken.clear()
+        retry = await matcher.match_found_item(found, lost, 0.0, load_existing)
+        return first, retry
+
+    (updated, failed), (retried, failed_again) = asyncio.run(scenario())
+    assert [lost.id for lost, _, _ in updated] == ["lost-1"]
+    assert failed == ["lost-2"]
+    # The retry only updates the lost item that failed — lost-1 is unchanged
+    assert [(lost.id, rank) for lost, _, rank in retried] == [("lost-2", 1)]
+    assert failed_again == []
+
+
+def test_reverse_candidates_are_capped_by_their_own_setting(tune, fake_groq):
+    async def scenario():
+        matcher = _matcher(tune, fake_groq)
+        tune(MAX_REVERSE_CANDIDATES=60, MAX_FOUND_ITEMS_PER_MATCH=50)
+        lost = [make_lost(f"lost-{i}", description=f"black wallet number {i}") for i in range(70)]
+
+        async def load_existing(_):
+            return []
+
+        await matcher.match_found_item(make_found(1), lost, 0.0, load_existing)
+
+    asyncio.run(scenario())
+    assert fake_groq.calls.count("score") == 60  # Not 50 — the found-item cap does not apply
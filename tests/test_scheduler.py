@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import pytest
+
+from services.scheduler import AdmissionRejected, DeadlineExceeded, MatchScheduler, Priority
+
+
+def _scheduler(tune, **overrides) -> MatchScheduler:
+    tune(**({"LLM_MAX_CONCURRENCY": 1, "WEIGHT_INTERACTIVE": 8, "WEIGHT_BATCH": 1} | overrides))
+    return MatchScheduler()
+
+
+async def _hold_slot(scheduler: MatchScheduler) -> tuple[asyncio.Event, asyncio.Task]:
+    """Occupy the only slot until the returned event is set."""
+    release = asyncio.Event()
+    holder  = asyncio.create_task(scheduler.run(Priority.INTERACTIVE, release.wait))
+    await asyncio.sleep(0)
+    return release, holder
+
+
+# ── Weighted-fair dispatch ──────────────────────────────────────────
+
+def test_backlogged_classes_share_slots_by_weight(tune):
+    async def scenario():
+        scheduler       = _scheduler(tune)
+        release, holder = await _hold_slot(scheduler)
+
+        order: list[Priority] = []
+
+        def call(priority):
+            async def fn():
+                order.append(priority)
+            return fn
+
+        tasks = [
+            asyncio.create_task(scheduler.run(p, call(p)))
+            for p in [Priority.BATCH] * 4 + [Priority.INTERACTIVE] * 16
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        return order
+
+    order = asyncio.run(scenario())
+    assert len(order) == 20
+    # Batch was queued first, yet interactive gets 8 slots for each batch one
+    assert order[:9].count(Priority.BATCH) == 1
+    assert order[:18].count(Priority.BATCH) == 2
+
+
+def test_class_returning_from_idle_does_not_bank_credit(tune):
+    async def scenario():
+        scheduler = _scheduler(tune)
+        # Batch runs alone while interactive is idle — only batch's virtual time moves
+        for _ in range(5):
+            await scheduler.run(Priority.BATCH, lambda: asyncio.sleep(0))
+
+        release, holder = await _hold_slot(scheduler)
+        order: list[Priority] = []
+
+        def call(priority):
+            async def fn():
+                order.append(priority)
+            return fn
+
+        tasks = [
+            asyncio.create_task(scheduler.run(p, call(p)))
+            for p in [Priority.INTERACTIVE] * 16 + [Priority.BATCH] * 3
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        return order
+
+    order = asyncio.run(scenario())
+    # Interactive starts from the current virtual time, not from zero — otherwise
+    # all 16 of its calls would run before batch got another slot
+    assert order[0] == Priority.INTERACTIVE
+    assert Priority.BATCH in order[:10]
+
+
+# ── Cancellation and deadlines ──────────────────────────────────────
+
+def test_cancelled_while_queued_frees_nothing_and_leaks_nothing(tune):
+    async def scenario():
+        scheduler       = _scheduler(tune)
+        release, holder = await _hold_slot(scheduler)
+
+        ran    = []
+        queued = asyncio.create_task(scheduler.run(Priority.INTERACTIVE, lambda: _append(ran, "cancelled")))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["classes"]["interactive"]["queue_depth"] == 1
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        release.set()
+        await holder
+        await scheduler.run(Priority.INTERACTIVE, lambda: _append(ran, "next"))
+        return scheduler, ran
+
+    scheduler, ran = asyncio.run(scenario())
+    assert ran == ["next"]
+    assert scheduler.stats()["active_slots"] == 0
+    assert scheduler.stats()["classes"]["interactive"]["queue_depth"] == 0
+
+
+def test_deadline_bounds_the_wait_for_a_slot(tune):
+    async def scenario():
+        scheduler       = _scheduler(tune)
+        release, holder = await _hold_slot(scheduler)
+
+        with pytest.raises(DeadlineExceeded):
+            await scheduler.run(Priority.INTERACTIVE, lambda: asyncio.sleep(0), deadline=time.monotonic() - 1)
+
+        release.set()
+        await holder
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    stats = scheduler.stats()
+    assert stats["classes"]["interactive"]["expired"] == 1
+    assert stats["classes"]["interactive"]["queue_depth"] == 0
+    assert stats["active_slots"] == 0
+
+
+# ── Admission ───────────────────────────────────────────────────────
+
+def test_admission_reserves_calls_until_released(tune):
+    scheduler = _scheduler(tune, MAX_INTERACTIVE_QUEUE_DEPTH=200)
+
+    admitted = [scheduler.admit(51) for _ in range(3)]   # 153 reserved, nothing queued yet
+    with pytest.raises(AdmissionRejected):
+        scheduler.admit(51)
+    assert scheduler.stats()["classes"]["interactive"]["shed"] == 1
+
+    admitted[0].resize(10)                               # Request found only 9 items
+    scheduler.admit(51).release()
+
+    for reservation in admitted:
+        reservation.release()
+    assert scheduler.stats()["reserved_calls"] == 0
+
+
+def test_lone_oversized_request_is_admitted(tune):
+    scheduler = _scheduler(tune, MAX_INTERACTIVE_QUEUE_DEPTH=10)
+    reservation = scheduler.admit(51)
+    with pytest.raises(AdmissionRejected):
+        scheduler.admit(1)
+    reservation.release()
+
+
+def test_pending_batch_jobs_are_capped(tune):
+    async def scenario():
+        scheduler = _scheduler(tune, MAX_PENDING_BATCH_JOBS=2)
+        gate      = asyncio.Event()
+
+        async def job():
+            await gate.wait()
+            return {"ok": True}
+
+        first  = scheduler.submit_job(job)
+        second = scheduler.submit_job(job)
+        with pytest.raises(AdmissionRejected):
+            scheduler.submit_job(job)
+
+        await asyncio.sleep(0)
+        assert scheduler.get_job(first)["status"]  == "running"
+        assert scheduler.get_job(second)["status"] == "queued"   # One job at a time
+
+        gate.set()
+        await asyncio.gather(*scheduler._job_tasks)
+        return scheduler.get_job(first), scheduler.get_job(second)
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == second["status"] == "done"
+    assert first["result"] == {"ok": True}
+
+
+async def _append(log: list, value) -> None:
+    log.append(value)